@@ -37,6 +37,44 @@ PROBS = {
 }
 
 
+def build_tables(probs):
+    """
+    Precompute the conditional probability tables used by `joint_probability`.
+
+    Returns a tuple (gene, inheritance, trait) where
+        * gene[genes] is the unconditional probability of `genes` copies,
+        * inheritance[mother][father][child] is the probability of the child
+          having `child` copies given the parents' gene counts, and
+        * trait[genes][has_trait] is the probability of the trait given genes.
+    """
+    mutation = probs["mutation"]
+
+    # Probability that a parent with `genes` copies passes the gene on
+    passes = {
+        0: mutation,
+        1: 0.5,
+        2: 1 - mutation
+    }
+
+    inheritance = {}
+    for mother in passes:
+        inheritance[mother] = {}
+        for father in passes:
+            m, f = passes[mother], passes[father]
+            inheritance[mother][father] = {
+                2: m * f,
+                1: m * (1 - f) + f * (1 - m),
+                0: (1 - m) * (1 - f)
+            }
+
+    gene = dict(probs["gene"])
+    trait = {genes: dict(values) for genes, values in probs["trait"].items()}
+    return gene, inheritance, trait
+
+
+GENE_TABLE, INHERITANCE_TABLE, TRAIT_TABLE = build_tables(PROBS)
+
+
 def main():
 
     # Check for proper usage
@@ -140,43 +178,23 @@ def joint_probability(people, one_gene, two_genes, have_trait):
         * everyone not in set` have_trait` does not have the trait.
     """
 
-    g = 1
-    t = 1
     p = 1
-    genes = None 
-    parents = {}
-
-    for person in people: 
-        if people[person]["mother"] is None and people[person]["father"] is None:
-            g = PROBS["gene"][1 if person in one_gene else 2 if person in two_genes else 0]
-
-        else: 
-            if people[person]["mother"] in one_gene:
-                parents["mother"] =  0.5
-            elif people[person]["mother"] in two_genes:
-                parents["mother"] = 1 - PROBS["mutation"]
-            else:
-                parents["mother"] = PROBS["mutation"]
-
-            if people[person]["father"] in one_gene:
-                parents["father"] =  0.5
-            elif people[person]["father"] in two_genes:
-                parents["father"] = 1 - PROBS["mutation"]
-            else:
-                parents["father"] = PROBS["mutation"]
-
-            if person in one_gene:
-                g = parents["mother"] * (1 - parents["father"]) + parents["father"] * (1 - parents["mother"])
-            elif person in two_genes:
-                g = parents["mother"] * parents["father"]
-            else:
-                g = (1 - parents["mother"]) * (1 - parents["father"])    
-        
-        t =  PROBS["trait"][1 if person in one_gene else 2 if person in two_genes else 0][person in have_trait]
-        p *= g * t
+    for person in people:
+        genes = 1 if person in one_gene else 2 if person in two_genes else 0
+        mother = people[person]["mother"]
+        father = people[person]["father"]
+
+        if mother is None and father is None:
+            g = GENE_TABLE[genes]
+        else:
+            mother_genes = 1 if mother in one_gene else 2 if mother in two_genes else 0
+            father_genes = 1 if father in one_gene else 2 if father in two_genes else 0
+            g = INHERITANCE_TABLE[mother_genes][father_genes][genes]
+
+        p *= g * TRAIT_TABLE[genes][person in have_trait]
 
     return p
-        
+
 
 def update(probabilities, one_gene, two_genes, have_trait, p):
     """
@@ -0,0 +1,181 @@
+import os
+import random
+import sys
+import time
+
+from logic import *
+from inference import forward_chaining_entails, resolution_entails
+from sat import sat_entails
+
+# Brute-force model checking is skipped above this many symbols
+MAX_BRUTE_FORCE = 16
+MAX_COMPILED = 24
+MAX_RESOLUTION = 20
+
+
+def random_statement(symbols, depth, rng):
+    """
+    Returns a random sentence over `symbols` of nesting depth `depth`.
+    """
+    if depth == 0:
+        symbol = rng.choice(symbols)
+        return symbol if rng.random() < 0.5 else Not(symbol)
+    kind = rng.choice([And, Or, Implication, Biconditional])
+    left = random_statement(symbols, depth - 1, rng)
+    right = random_statement(symbols, depth - 1, rng)
+    return kind(left, right)
+
+
+def random_puzzle(people, seed=0):
+    """
+    Generates a consistent knights-and-knaves puzzle with `people`
+    characters (2 * `people` symbols). Each character makes one random
+    statement about the others, true for knights and false for knaves.
+
+    Returns (knowledge, symbols).
+    """
+    rng = random.Random(seed)
+    knights = [Symbol(f"{i} is a Knight") for i in range(people)]
+    knaves = [Symbol(f"{i} is a Knave") for i in range(people)]
+    truth = {knight.name: rng.random() < 0.5 for knight in knights}
+    for knight, knave in zip(knights, knaves):
+        truth[knave.name] = not truth[knight.name]
+
+    knowledge = And()
+    for knight, knave in zip(knights, knaves):
+        knowledge.add(Or(knight, knave))
+        knowledge.add(Not(And(knight, knave)))
+    for i in range(people):
+        statement = random_statement(knights + knaves, 2, rng)
+        if statement.evaluate(truth) != truth[knights[i].name]:
+            statement = Not(statement)
+        knowledge.add(Implication(knights[i], statement))
+        knowledge.add(Implication(knaves[i], Not(statement)))
+    return knowledge, knights + knaves
+
+
+def timed(engine, knowledge, symbols):
+    """
+    Runs `engine` on every symbol as a query.
+    Returns (entailed symbols, seconds).
+    """
+    start = time.perf_counter()
+    entailed = {symbol for symbol in symbols if engine(knowledge, symbol)}
+    return entailed, time.perf_counter() - start
+
+
+def timed_batch(knowledge, symbols):
+    """
+    Answers every symbol query from a single ModelSet.
+    Returns (entailed symbols, seconds).
+    """
+    start = time.perf_counter()
+    entailed = ModelSet(knowledge, symbols).entailed(symbols)
+    entailed = {symbol for symbol in symbols if entailed[symbol]}
+    return entailed, time.perf_counter() - start
+
+
+def horn_chain(n):
+    """
+    Generates a Horn knowledge base over n symbols where each symbol
+    follows from the two before it, and the first two are facts.
+
+    Returns (knowledge, last symbol).
+    """
+    symbols = [Symbol(f"p{i}") for i in range(n)]
+    knowledge = And(symbols[0], symbols[1])
+    for i in range(2, n):
+        knowledge.add(Implication(And(symbols[i - 2], symbols[i - 1]),
+                                  symbols[i]))
+    return knowledge, symbols[-1]
+
+
+def horn_scaling():
+    """
+    Prints forward chaining, resolution and model checking times
+    on Horn chains of growing length.
+    """
+    print(f"{'symbols':>8} {'model_check':>12} {'resolution':>11} {'forward':>10}")
+    for n in [8, 16, 100, 1000, 10000]:
+        knowledge, query = horn_chain(n)
+        row = [f"{n:>8}"]
+        for engine, limit, width in [
+            (model_check, MAX_BRUTE_FORCE, 12),
+            (resolution_entails, 1000, 11),
+            (forward_chaining_entails, n, 10)
+        ]:
+            if n <= limit:
+                entailed, seconds = timed(engine, knowledge, [query])
+                if not entailed:
+                    sys.exit(f"{engine.__name__} failed on {n} symbols")
+                row.append(f"{seconds:.4f}s".rjust(width))
+            else:
+                row.append("-".rjust(width))
+        print(" ".join(row))
+
+
+def parallel_speedup(people):
+    """
+    Prints the speedup of model_check_parallel over model_check across
+    process counts, on a query that forces a full enumeration.
+    """
+    knowledge, symbols = random_puzzle(people)
+    query = next(symbol for symbol in symbols
+                 if sat_entails(knowledge, symbol))
+
+    start = time.perf_counter()
+    model_check(knowledge, query)
+    serial = time.perf_counter() - start
+    print(f"{len(symbols)} symbols, serial {serial:.4f}s")
+    print(f"{'processes':>9} {'time':>10} {'speedup':>8}")
+    for processes in range(1, (os.cpu_count() or 1) + 1):
+        start = time.perf_counter()
+        model_check_parallel(knowledge, query, split=6, processes=processes)
+        seconds = time.perf_counter() - start
+        print(f"{processes:>9} {seconds:>9.4f}s {serial / seconds:>7.2f}x")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "parallel":
+        parallel_speedup(int(sys.argv[2]) if len(sys.argv) > 2 else 8)
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "horn":
+        horn_scaling()
+        return
+    sizes = [int(n) for n in sys.argv[1:]] or [4, 8, 10, 12, 20, 30]
+    print(f"{'symbols':>8} {'model_check':>12} {'compiled':>10} {'batch':>10} {'resolution':>11} {'sat':>10}")
+    for people in sizes:
+        knowledge, symbols = random_puzzle(people)
+        sat, sat_time = timed(sat_entails, knowledge, symbols)
+        row = [f"{len(symbols):>8}"]
+        for engine, limit, width in [
+            (model_check, MAX_BRUTE_FORCE, 12),
+            (model_check_compiled, MAX_COMPILED, 10)
+        ]:
+            if len(symbols) <= limit:
+                entailed, seconds = timed(engine, knowledge, symbols)
+                if entailed != sat:
+                    sys.exit(f"Engines disagree on {len(symbols)} symbols")
+                row.append(f"{seconds:.4f}s".rjust(width))
+            else:
+                row.append("-".rjust(width))
+        if len(symbols) <= MAX_COMPILED:
+            entailed, seconds = timed_batch(knowledge, symbols)
+            if entailed != sat:
+                sys.exit(f"Engines disagree on {len(symbols)} symbols")
+            row.append(f"{seconds:.4f}s".rjust(10))
+        else:
+            row.append("-".rjust(10))
+        if len(symbols) <= MAX_RESOLUTION:
+            entailed, seconds = timed(resolution_entails, knowledge, symbols)
+            if entailed != sat:
+                sys.exit(f"Engines disagree on {len(symbols)} symbols")
+            row.append(f"{seconds:.4f}s".rjust(11))
+        else:
+            row.append("-".rjust(11))
+        row.append(f"{sat_time:.4f}s".rjust(10))
+        print(" ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import heapq
+
+from collections import defaultdict, deque
+
+from logic import *
+from sat import Encoder
+
+
+def to_cnf(sentence, encoder, positive=True):
+    """
+    Converts `sentence` (or its negation, if `positive` is False) into an
+    equivalent list of clauses, each a frozenset of integer literals from
+    `encoder`. Unlike the Tseitin encoding no auxiliary variables are
+    introduced, so Horn knowledge stays Horn.
+    """
+    if isinstance(sentence, Symbol):
+        var = encoder.variable(sentence.name)
+        return [frozenset((var if positive else -var,))]
+    if isinstance(sentence, Not):
+        return to_cnf(sentence.operand, encoder, not positive)
+
+    if isinstance(sentence, And):
+        parts = [to_cnf(c, encoder, positive) for c in sentence.conjuncts]
+        return conjoin(parts) if positive else disjoin(parts)
+    if isinstance(sentence, Or):
+        parts = [to_cnf(d, encoder, positive) for d in sentence.disjuncts]
+        return disjoin(parts) if positive else conjoin(parts)
+    if isinstance(sentence, Implication):
+        if positive:
+            return disjoin([to_cnf(sentence.antecedent, encoder, False),
+                            to_cnf(sentence.consequent, encoder, True)])
+        return conjoin([to_cnf(sentence.antecedent, encoder, True),
+                        to_cnf(sentence.consequent, encoder, False)])
+    if isinstance(sentence, Biconditional):
+        left, right = sentence.left, sentence.right
+        return conjoin([
+            disjoin([to_cnf(left, encoder, False),
+                     to_cnf(right, encoder, positive)]),
+            disjoin([to_cnf(left, encoder, True),
+                     to_cnf(right, encoder, not positive)])
+        ])
+    raise TypeError("must be a logical sentence")
+
+
+def conjoin(parts):
+    """Returns the CNF of the conjunction of CNF `parts`."""
+    return list(dict.fromkeys(clause for part in parts for clause in part))
+
+
+def disjoin(parts):
+    """Returns the CNF of the disjunction of CNF `parts`, by distribution."""
+    result = [frozenset()]
+    for part in parts:
+        result = [a | b for a in result for b in part if not tautology(a | b)]
+        result = list(dict.fromkeys(result))
+    return result
+
+
+def tautology(clause):
+    """Checks if a clause contains a literal and its negation."""
+    return any(-lit in clause for lit in clause)
+
+
+def resolution_entails(knowledge, query):
+    """
+    Checks if knowledge base entails query by resolution refutation:
+    saturates the clauses of knowledge ∧ ¬query, smallest clauses first,
+    until the empty clause is derived or no new clauses remain.
+    """
+    encoder = Encoder()
+    clauses = to_cnf(knowledge, encoder) + to_cnf(query, encoder, False)
+
+    # Processed clauses, indexed by the literals they contain
+    processed = dict()
+    index = defaultdict(set)
+    counter = 0
+
+    queue = []
+    for clause in clauses:
+        heapq.heappush(queue, (len(clause), counter, clause))
+        counter += 1
+
+    while queue:
+        _, _, clause = heapq.heappop(queue)
+        if not clause:
+            return True
+
+        # Forward subsumption: skip clauses implied by a processed clause
+        candidates = set().union(*[index[lit] for lit in clause])
+        if any(processed[c] <= clause for c in candidates):
+            continue
+
+        # Backward subsumption: drop processed clauses this one implies
+        for c in set.intersection(*[index[lit] for lit in clause]):
+            for lit in processed[c]:
+                index[lit].discard(c)
+            del processed[c]
+
+        # Resolve against every processed clause with a complementary literal
+        for lit in clause:
+            for c in list(index[-lit]):
+                resolvent = (clause - {lit}) | (processed[c] - {-lit})
+                if not resolvent:
+                    return True
+                if not tautology(resolvent):
+                    heapq.heappush(queue, (len(resolvent), counter, resolvent))
+                    counter += 1
+
+        processed[counter] = clause
+        for lit in clause:
+            index[lit].add(counter)
+        counter += 1
+
+    return False
+
+
+def forward_chaining_entails(knowledge, query):
+    """
+    Checks if a Horn knowledge base entails the symbol `query`, in time
+    linear in the size of the knowledge base.
+    """
+    if not isinstance(query, Symbol):
+        raise TypeError("query must be a symbol")
+    encoder = Encoder()
+    clauses = to_cnf(knowledge, encoder)
+    goal = encoder.variable(query.name)
+
+    # Count unsatisfied premises of every clause, indexed by premise
+    heads = []
+    count = []
+    premises = defaultdict(list)
+    agenda = deque()
+    for clause in clauses:
+        if not clause:
+            return True
+        positive = [lit for lit in clause if lit > 0]
+        if len(positive) > 1:
+            raise Exception("knowledge base is not Horn")
+        head = positive[0] if positive else None
+        if len(clause) == 1 and head is not None:
+            agenda.append(head)
+        for lit in clause:
+            if lit < 0:
+                premises[-lit].append(len(heads))
+        heads.append(head)
+        count.append(len(clause) - len(positive))
+
+    inferred = set()
+    while agenda:
+        p = agenda.popleft()
+        if p == goal:
+            return True
+        if p in inferred:
+            continue
+        inferred.add(p)
+        for c in premises[p]:
+            count[c] -= 1
+            if count[c] == 0:
+
+                # A violated goal clause makes the knowledge inconsistent
+                if heads[c] is None:
+                    return True
+                agenda.append(heads[c])
+
+    return False
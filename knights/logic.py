@@ -1,7 +1,148 @@
+import inspect
 import itertools
+import multiprocessing
+import weakref
 
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
-class Sentence():
+
+class Interned(type):
+    """
+    Metaclass that hash-conses sentences: constructing a sentence that is
+    structurally identical to a live one returns the existing object.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if kwargs:
+            # Key keyword arguments by position, so that they intern
+            # with the same sentences built from positional arguments
+            bound = inspect.signature(cls.__init__).bind(None, *args, **kwargs)
+            args = bound.args[1:]
+        key = cls.intern_key(args)
+        if key is None:
+            return super().__call__(*args)
+        sentence = Sentence.interned.get(key)
+        if sentence is None:
+            sentence = super().__call__(*args)
+            Sentence.interned[key] = sentence
+        return sentence
+
+
+class Sentence(metaclass=Interned):
+
+    __slots__ = ("_parents", "_volatile", "_hash", "_symbols", "_formula",
+                 "__weakref__")
+
+    # Whether sentences of this class can change after construction
+    mutable = False
+
+    # Live sentences, keyed by structure
+    interned = weakref.WeakValueDictionary()
+
+    def __init__(self):
+        self._parents = None
+        self._volatile = self.mutable
+        self._hash = None
+        self._symbols = None
+        self._formula = None
+
+    def __eq__(self, other):
+        return self is other or self._equals(other)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = self._structural_hash()
+        return self._hash
+
+    @classmethod
+    def intern_key(cls, args):
+        """
+        Returns the key identifying a sentence built from `args`, or None
+        if sentences of this class should not be shared.
+        Children are interned themselves, so they are keyed by identity.
+        """
+        return (cls,) + tuple(id(arg) for arg in args)
+
+    def __getstate__(self):
+        # Parent links are weak references, which cannot be pickled;
+        # they are rebuilt from the children when unpickling
+        return {name: getattr(self, name)
+                for cls in type(self).__mro__
+                for name in getattr(cls, "__slots__", ())
+                if name not in Sentence.__slots__}
+
+    def __setstate__(self, state):
+        Sentence.__init__(self)
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.adopt(*self._children())
+
+    def _children(self):
+        """Returns the sentences this sentence is built from."""
+        return ()
+
+    def adopt(self, *children):
+        """
+        Records this sentence as a parent of each of `children` that can
+        change, that is, that is or contains a mutable sentence. Other
+        children never invalidate their parents, so they keep no links.
+
+        Parents are kept by identity, not by structure, so that equal
+        parents are all invalidated. A child with a single parent holds
+        a weak reference to it, and one with several a dictionary of
+        them keyed by id.
+        """
+        parent = None
+        for child in children:
+            if not child._volatile:
+                continue
+            self._volatile = True
+            if parent is None:
+                parent = weakref.ref(self)
+            parents = child._parents
+            if parents is None or parents is parent:
+                child._parents = parent
+            elif isinstance(parents, dict):
+                parents[id(self)] = parent
+            else:
+                other = parents()
+                child._parents = {id(self): parent}
+                if other is not None:
+                    child._parents[id(other)] = parents
+
+    def parents(self):
+        """Returns the live sentences this sentence is part of."""
+        parents = self._parents
+        if parents is None:
+            return []
+        if not isinstance(parents, dict):
+            parent = parents()
+            return [] if parent is None else [parent]
+        live = []
+        for key, ref in list(parents.items()):
+            parent = ref()
+            if parent is None:
+                del parents[key]
+            else:
+                live.append(parent)
+        return live
+
+    def invalidate(self):
+        """
+        Clears cached hash, symbols and formula of this sentence and of
+        every sentence containing it.
+        """
+        stack = [self]
+        seen = set()
+        while stack:
+            sentence = stack.pop()
+            if id(sentence) in seen:
+                continue
+            seen.add(id(sentence))
+            sentence._hash = None
+            sentence._symbols = None
+            sentence._formula = None
+            stack.extend(sentence.parents())
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -9,11 +150,39 @@ class Sentence():
 
     def formula(self):
         """Returns string formula representing logical sentence."""
-        return ""
+        if self._formula is None:
+            self._formula = self._render()
+        return self._formula
 
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
-        return set()
+        return set(self.symbol_set())
+
+    def symbol_set(self):
+        """Returns a cached frozenset of all symbols in the sentence."""
+        if self._symbols is None:
+            self._symbols = self._collect_symbols()
+        return self._symbols
+
+    def _equals(self, other):
+        return False
+
+    def _structural_hash(self):
+        return hash(())
+
+    def _render(self):
+        return ""
+
+    def _collect_symbols(self):
+        return frozenset()
+
+    def source(self, leaf, one):
+        """
+        Returns a Python expression computing the sentence with bitwise
+        operators, where `leaf(name)` gives the expression for a symbol
+        and `one` the expression for an all-true value.
+        """
+        raise Exception("nothing to compile")
 
     @classmethod
     def validate(cls, sentence):
@@ -44,13 +213,20 @@ class Sentence():
 
 class Symbol(Sentence):
 
+    __slots__ = ("name",)
+
     def __init__(self, name):
+        super().__init__()
         self.name = name
 
-    def __eq__(self, other):
+    @classmethod
+    def intern_key(cls, args):
+        return (cls,) + tuple(args)
+
+    def _equals(self, other):
         return isinstance(other, Symbol) and self.name == other.name
 
-    def __hash__(self):
+    def _structural_hash(self):
         return hash(("symbol", self.name))
 
     def __repr__(self):
@@ -62,47 +238,73 @@ class Symbol(Sentence):
         except KeyError:
             raise Exception(f"variable {self.name} not in model")
 
-    def formula(self):
+    def _render(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    def _collect_symbols(self):
+        return frozenset((self.name,))
+
+    def source(self, leaf, one):
+        return leaf(self.name)
 
 
 class Not(Sentence):
+
+    __slots__ = ("operand",)
+
     def __init__(self, operand):
         Sentence.validate(operand)
+        super().__init__()
         self.operand = operand
+        self.adopt(operand)
 
-    def __eq__(self, other):
+    def _equals(self, other):
         return isinstance(other, Not) and self.operand == other.operand
 
-    def __hash__(self):
+    def _structural_hash(self):
         return hash(("not", hash(self.operand)))
 
+    def _children(self):
+        return (self.operand,)
+
     def __repr__(self):
         return f"Not({self.operand})"
 
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
-    def formula(self):
+    def _render(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
+    def _collect_symbols(self):
+        return self.operand.symbol_set()
+
+    def source(self, leaf, one):
+        return f"({one} ^ {self.operand.source(leaf, one)})"
 
 
 class And(Sentence):
+
+    __slots__ = ("conjuncts",)
+
+    mutable = True
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
+        super().__init__()
         self.conjuncts = list(conjuncts)
+        self.adopt(*conjuncts)
 
-    def __eq__(self, other):
+    @classmethod
+    def intern_key(cls, args):
+        # Conjunctions can grow through `add`, so they are never shared
+        return None
+
+    def _equals(self, other):
         return isinstance(other, And) and self.conjuncts == other.conjuncts
 
-    def __hash__(self):
+    def _structural_hash(self):
         return hash(
             ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
         )
@@ -113,37 +315,58 @@ class And(Sentence):
         )
         return f"And({conjunctions})"
 
+    def _children(self):
+        return tuple(self.conjuncts)
+
     def add(self, conjunct):
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
+        self.adopt(conjunct)
+        self.invalidate()
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
-    def formula(self):
+    def _render(self):
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+    def _collect_symbols(self):
+        return frozenset().union(
+            *[conjunct.symbol_set() for conjunct in self.conjuncts]
+        )
+
+    def source(self, leaf, one):
+        if not self.conjuncts:
+            return one
+        return "(" + " & ".join(conjunct.source(leaf, one)
+                                for conjunct in self.conjuncts) + ")"
 
 
 class Or(Sentence):
+
+    __slots__ = ("disjuncts",)
+
     def __init__(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
+        super().__init__()
         self.disjuncts = list(disjuncts)
+        self.adopt(*disjuncts)
 
-    def __eq__(self, other):
+    def _equals(self, other):
         return isinstance(other, Or) and self.disjuncts == other.disjuncts
 
-    def __hash__(self):
+    def _structural_hash(self):
         return hash(
             ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
         )
 
+    def _children(self):
+        return tuple(self.disjuncts)
+
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
         return f"Or({disjuncts})"
@@ -151,31 +374,47 @@ class Or(Sentence):
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
-    def formula(self):
+    def _render(self):
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+    def _collect_symbols(self):
+        return frozenset().union(
+            *[disjunct.symbol_set() for disjunct in self.disjuncts]
+        )
+
+    def source(self, leaf, one):
+        if not self.disjuncts:
+            return "0"
+        return "(" + " | ".join(disjunct.source(leaf, one)
+                                for disjunct in self.disjuncts) + ")"
 
 
 class Implication(Sentence):
+
+    __slots__ = ("antecedent", "consequent")
+
     def __init__(self, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
+        super().__init__()
         self.antecedent = antecedent
         self.consequent = consequent
+        self.adopt(antecedent, consequent)
 
-    def __eq__(self, other):
+    def _equals(self, other):
         return (isinstance(other, Implication)
                 and self.antecedent == other.antecedent
                 and self.consequent == other.consequent)
 
-    def __hash__(self):
+    def _structural_hash(self):
         return hash(("implies", hash(self.antecedent), hash(self.consequent)))
 
+    def _children(self):
+        return (self.antecedent, self.consequent)
+
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
 
@@ -183,46 +422,61 @@ class Implication(Sentence):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
-    def formula(self):
+    def _render(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+    def _collect_symbols(self):
+        return self.antecedent.symbol_set() | self.consequent.symbol_set()
+
+    def source(self, leaf, one):
+        antecedent = self.antecedent.source(leaf, one)
+        consequent = self.consequent.source(leaf, one)
+        return f"(({one} ^ {antecedent}) | {consequent})"
 
 
 class Biconditional(Sentence):
+
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
+        super().__init__()
         self.left = left
         self.right = right
+        self.adopt(left, right)
 
-    def __eq__(self, other):
+    def _equals(self, other):
         return (isinstance(other, Biconditional)
                 and self.left == other.left
                 and self.right == other.right)
 
-    def __hash__(self):
+    def _structural_hash(self):
         return hash(("biconditional", hash(self.left), hash(self.right)))
 
+    def _children(self):
+        return (self.left, self.right)
+
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
 
     def evaluate(self, model):
-        return ((self.left.evaluate(model)
-                 and self.right.evaluate(model))
-                or (not self.left.evaluate(model)
-                    and not self.right.evaluate(model)))
+        return self.left.evaluate(model) == self.right.evaluate(model)
 
-    def formula(self):
+    def _render(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
+    def _collect_symbols(self):
+        return self.left.symbol_set() | self.right.symbol_set()
+
+    def source(self, leaf, one):
+        left = self.left.source(leaf, one)
+        right = self.right.source(leaf, one)
+        return f"({one} ^ {left} ^ {right})"
 
 
 def model_check(knowledge, query):
@@ -261,3 +515,200 @@ def model_check(knowledge, query):
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+# Set in worker processes once any partition finds a counter-model
+_stop = None
+
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+
+def _check_partition(knowledge, query, symbols, model):
+    """
+    Checks entailment over every completion of the partial `model`,
+    giving up early if another partition has found a counter-model.
+    """
+    if not symbols:
+        if knowledge.evaluate(model):
+            return query.evaluate(model)
+        return True
+
+    # Periodically check whether the search was cancelled
+    if len(symbols) % 8 == 0 and _stop.is_set():
+        return True
+
+    remaining = symbols.copy()
+    p = remaining.pop()
+    model[p] = True
+    if not _check_partition(knowledge, query, remaining, model):
+        return False
+    model[p] = False
+    result = _check_partition(knowledge, query, remaining, model)
+    del model[p]
+    return result
+
+
+def model_check_parallel(knowledge, query, split=4, processes=None):
+    """
+    Checks if knowledge base entails query, splitting the models into
+    2 ** `split` partitions by fixing the first `split` symbols and
+    checking the partitions in a pool of `processes` worker processes.
+    """
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    fixed, remaining = symbols[:split], set(symbols[split:])
+
+    stop = multiprocessing.Event()
+    executor = ProcessPoolExecutor(processes, initializer=_init_worker,
+                                   initargs=(stop,))
+    try:
+        pending = {
+            executor.submit(_check_partition, knowledge, query, remaining,
+                            dict(zip(fixed, values)))
+            for values in itertools.product([True, False], repeat=len(fixed))
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if not all(future.result() for future in done):
+                stop.set()
+                return False
+        return True
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def compile_sentence(sentence, symbols):
+    """
+    Compiles a sentence into a function of (columns, full).
+
+    `symbols` is a list of symbol names. Bit k of `columns[i]` is the
+    truth value of `symbols[i]` in model k, `full` has the bit of every
+    model set, and bit k of the result is the sentence's value in model k.
+    """
+    index = {name: i for i, name in enumerate(symbols)}
+    source = sentence.source(lambda name: f"c[{index[name]}]", "f")
+    return eval(f"lambda c, f: {source}")
+
+
+# Number of models evaluated together by each bitwise pass
+BLOCK_BITS = 12
+
+
+def model_check_compiled(knowledge, query):
+    """
+    Checks if knowledge base entails query, evaluating blocks of
+    2 ** BLOCK_BITS models at once.
+
+    Each symbol becomes an integer column whose bit k is the symbol's
+    value in model k, so a single evaluation of the compiled sentence
+    over the columns checks every model in the block.
+    """
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    columns, full, blocks = model_columns(len(symbols))
+    check = compile_sentence(And(knowledge, Not(query)), symbols)
+
+    # A counter-model makes the knowledge true and the query false
+    for block in range(blocks):
+        if check(block_columns(columns, full, block, len(symbols)), full):
+            return False
+    return True
+
+
+def model_columns(n):
+    """
+    Returns (columns, full, blocks) for enumerating all models of n symbols.
+
+    `columns` holds the bit patterns of the symbols that vary within a
+    block, `full` is the all-true value for a block and `blocks` is the
+    number of blocks needed to cover every model.
+    """
+    k = min(n, BLOCK_BITS)
+    width = 1 << k
+    full = (1 << width) - 1
+    columns = []
+    for i in range(k):
+        period = 1 << (i + 1)
+        column = ((1 << (1 << i)) - 1) << (1 << i)
+        while period < width:
+            column |= column << period
+            period *= 2
+        columns.append(column)
+    return columns, full, 1 << (n - k)
+
+
+def block_columns(columns, full, block, n):
+    """
+    Returns the columns for all n symbols in block number `block`.
+    Symbols beyond the block are constant within it.
+    """
+    return columns + [
+        full if block >> i & 1 else 0
+        for i in range(n - len(columns))
+    ]
+
+
+class ModelSet():
+    """
+    The set of models satisfying a knowledge base, enumerated once so that
+    any number of entailment queries can be answered against it.
+    """
+
+    def __init__(self, knowledge, symbols=()):
+        """
+        Enumerates the models of `knowledge` over its own symbols
+        plus any extra `symbols` that queries may mention.
+        """
+        names = set.union(knowledge.symbols(),
+                          {symbol.name for symbol in symbols})
+        self.symbols = sorted(names)
+        self.index = {name: i for i, name in enumerate(self.symbols)}
+        columns, self.full, blocks = model_columns(len(self.symbols))
+        compiled = self.compile(knowledge)
+
+        # Keep (columns, satisfying models) for every block with a model
+        self.blocks = []
+        for block in range(blocks):
+            block = block_columns(columns, self.full, block, len(self.symbols))
+            models = compiled(block, self.full)
+            if models:
+                self.blocks.append((block, models))
+
+    def compile(self, sentence):
+        """Compiles `sentence` into a function of (columns, full)."""
+        for name in sentence.symbol_set():
+            if name not in self.index:
+                raise Exception(f"variable {name} not in model")
+        return compile_sentence(sentence, self.symbols)
+
+    def count(self):
+        """Returns the number of models satisfying the knowledge base."""
+        return sum(models.bit_count() for _, models in self.blocks)
+
+    def entails(self, query):
+        """Checks if the knowledge base entails `query`."""
+        compiled = self.compile(query)
+        return not any(models & (self.full ^ compiled(block, self.full))
+                       for block, models in self.blocks)
+
+    def entailed(self, symbols):
+        """
+        Checks every symbol in one pass over the models.
+
+        Returns a dictionary mapping each symbol to True if the knowledge
+        base entails it, False if it entails its negation, and None if
+        neither is entailed.
+        """
+        positions = [self.index[symbol.name] for symbol in symbols]
+        sometimes_true = [0] * len(positions)
+        sometimes_false = [0] * len(positions)
+        for block, models in self.blocks:
+            for k, i in enumerate(positions):
+                sometimes_true[k] |= models & block[i]
+                sometimes_false[k] |= models & (self.full ^ block[i])
+        return {
+            symbol: (True if not sometimes_false[k] else
+                     False if not sometimes_true[k] else None)
+            for k, symbol in enumerate(symbols)
+        }
@@ -0,0 +1,242 @@
+from logic import *
+
+
+class Encoder():
+    """
+    Tseitin encoding of logical sentences into CNF.
+
+    Every symbol and every compound subformula is assigned a positive
+    integer variable; a literal is a variable or its negation. Clauses
+    are lists of literals, in the DIMACS convention.
+    """
+
+    def __init__(self):
+        self.variables = dict()
+        self.names = dict()
+        self.clauses = []
+        self.num_vars = 0
+        self.cache = dict()
+
+    def new_var(self, name=None):
+        """Creates and returns a fresh variable."""
+        self.num_vars += 1
+        if name is not None:
+            self.variables[name] = self.num_vars
+            self.names[self.num_vars] = name
+        return self.num_vars
+
+    def variable(self, name):
+        """Returns the variable for symbol `name`, creating it if needed."""
+        if name not in self.variables:
+            return self.new_var(name)
+        return self.variables[name]
+
+    def literal(self, sentence):
+        """
+        Returns a literal equivalent to `sentence`, adding the clauses
+        that define any auxiliary variables along the way.
+        """
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+        if sentence in self.cache:
+            return self.cache[sentence]
+
+        if isinstance(sentence, And):
+            children = [self.literal(c) for c in sentence.conjuncts]
+            x = self.new_var()
+            for c in children:
+                self.clauses.append([-x, c])
+            self.clauses.append([x] + [-c for c in children])
+        elif isinstance(sentence, Or):
+            children = [self.literal(d) for d in sentence.disjuncts]
+            x = self.new_var()
+            for d in children:
+                self.clauses.append([x, -d])
+            self.clauses.append([-x] + children)
+        elif isinstance(sentence, Implication):
+            a = self.literal(sentence.antecedent)
+            b = self.literal(sentence.consequent)
+            x = self.new_var()
+            self.clauses.append([-x, -a, b])
+            self.clauses.append([x, a])
+            self.clauses.append([x, -b])
+        elif isinstance(sentence, Biconditional):
+            a = self.literal(sentence.left)
+            b = self.literal(sentence.right)
+            x = self.new_var()
+            self.clauses.append([-x, -a, b])
+            self.clauses.append([-x, a, -b])
+            self.clauses.append([x, a, b])
+            self.clauses.append([x, -a, -b])
+        else:
+            raise TypeError("must be a logical sentence")
+
+        self.cache[sentence] = x
+        return x
+
+    def add(self, sentence):
+        """Asserts that `sentence` is true."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or) and all(
+            isinstance(d, Symbol) or (isinstance(d, Not) and isinstance(d.operand, Symbol))
+            for d in sentence.disjuncts
+        ):
+            self.clauses.append([self.literal(d) for d in sentence.disjuncts])
+        else:
+            self.clauses.append([self.literal(sentence)])
+
+
+class Solver():
+    """
+    DPLL satisfiability solver with unit propagation over two
+    watched literals per clause.
+    """
+
+    def __init__(self, num_vars, clauses):
+        self.num_vars = num_vars
+        self.values = [0] * (num_vars + 1)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.clauses = []
+        self.watches = {lit: [] for v in range(1, num_vars + 1) for lit in (v, -v)}
+        self.units = []
+        self.conflict = False
+
+        # Remove duplicate literals and tautologies, then attach watches
+        occurrences = [0] * (num_vars + 1)
+        for clause in clauses:
+            clause = list(dict.fromkeys(clause))
+            if any(-lit in clause for lit in clause):
+                continue
+            if not clause:
+                self.conflict = True
+            elif len(clause) == 1:
+                self.units.append(clause[0])
+            else:
+                self.watches[clause[0]].append(len(self.clauses))
+                self.watches[clause[1]].append(len(self.clauses))
+                self.clauses.append(clause)
+            for lit in clause:
+                occurrences[abs(lit)] += 1
+
+        # Branch on the most frequently occurring variables first
+        self.order = sorted(range(1, num_vars + 1),
+                            key=lambda v: occurrences[v], reverse=True)
+
+    def value(self, lit):
+        """Returns 1 if `lit` is true, -1 if false, 0 if unassigned."""
+        v = self.values[abs(lit)]
+        return v if lit > 0 else -v
+
+    def enqueue(self, lit):
+        """Assigns `lit` true; returns False if it is already false."""
+        v = self.value(lit)
+        if v != 0:
+            return v > 0
+        self.values[abs(lit)] = 1 if lit > 0 else -1
+        self.trail.append(lit)
+        return True
+
+    def propagate(self):
+        """
+        Performs unit propagation over the trail.
+        Returns False if a clause became falsified.
+        """
+        values = self.values
+        clauses = self.clauses
+        watches = self.watches
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            watching = watches[false_lit]
+            i = 0
+            while i < len(watching):
+                clause = clauses[watching[i]]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                v = values[abs(first)]
+                if (v if first > 0 else -v) > 0:
+                    i += 1
+                    continue
+
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    v = values[abs(lit)]
+                    if (v if lit > 0 else -v) >= 0:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[lit].append(watching[i])
+                        watching[i] = watching[-1]
+                        watching.pop()
+                        break
+                else:
+                    # Clause is unit or conflicting
+                    if not self.enqueue(first):
+                        return False
+                    i += 1
+        return True
+
+    def backtrack(self, level):
+        """Undoes all assignments above decision level `level`."""
+        for lit in self.trail[self.trail_lim[level]:]:
+            self.values[abs(lit)] = 0
+        del self.trail[self.trail_lim[level]:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def solve(self):
+        """Returns True if the clauses are satisfiable, False otherwise."""
+        if self.conflict:
+            return False
+        for lit in self.units:
+            if not self.enqueue(lit):
+                return False
+
+        # Each decision records its literal and whether it was flipped
+        decisions = []
+        while True:
+            if not self.propagate():
+
+                # Undo decisions until one can be flipped
+                while decisions and decisions[-1][1]:
+                    decisions.pop()
+                if not decisions:
+                    return False
+                lit, _ = decisions.pop()
+                self.backtrack(len(decisions))
+                self.trail_lim.append(len(self.trail))
+                decisions.append((-lit, True))
+                self.enqueue(-lit)
+                continue
+
+            # Choose the next unassigned variable
+            for var in self.order:
+                if self.values[var] == 0:
+                    break
+            else:
+                return True
+            self.trail_lim.append(len(self.trail))
+            decisions.append((var, False))
+            self.enqueue(var)
+
+    def model(self, encoder):
+        """Returns the satisfying assignment of the encoder's symbols."""
+        return {name: self.values[var] > 0
+                for name, var in encoder.variables.items()}
+
+
+def sat_entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, by testing whether
+    knowledge ∧ ¬query is unsatisfiable.
+    """
+    encoder = Encoder()
+    encoder.add(knowledge)
+    encoder.add(Not(query))
+    return not Solver(encoder.num_vars, encoder.clauses).solve()
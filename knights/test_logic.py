@@ -0,0 +1,14 @@
+from logic import (And, Biconditional, Implication, Not, Or, Symbol,
+                   compile_sentence, model_columns)
+
+
+def test_compiled_sentence_matches_evaluate():
+    a, b, c = Symbol("a"), Symbol("b"), Symbol("c")
+    sentence = And(Or(a, Not(b)), Implication(b, c),
+                   Biconditional(Not(a), And(b, c)))
+    symbols = ["a", "b", "c"]
+    columns, full, _ = model_columns(len(symbols))
+    compiled = compile_sentence(sentence, symbols)(columns, full)
+    for mask in range(1 << len(symbols)):
+        model = {name: bool(mask >> i & 1) for i, name in enumerate(symbols)}
+        assert bool(compiled >> mask & 1) == sentence.evaluate(model)
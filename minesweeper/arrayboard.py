@@ -0,0 +1,50 @@
+import random
+
+import numpy as np
+
+from minesweeper import Minesweeper
+
+
+class ArrayMinesweeper(Minesweeper):
+    """
+    Minesweeper game representation backed by NumPy arrays, for
+    simulating very large boards
+    """
+
+    def __init__(self, height=8, width=8, mines=8):
+
+        # Set initial width, height, and number of mines
+        self.height = height
+        self.width = width
+
+        # Place all mines at once from a random permutation of the cells,
+        # seeded from `random` so that random.seed makes games repeatable
+        rng = np.random.default_rng(random.getrandbits(64))
+        cells = rng.permutation(height * width)[:mines]
+        self.board = np.zeros((height, width), dtype=bool)
+        self.board.flat[cells] = True
+        self.mines = set(zip(*(index.tolist() for index in
+                               np.unravel_index(cells, (height, width)))))
+
+        # Count the mines around every cell with one 3x3 box sum
+        padded = np.pad(self.board, 1).astype(np.uint8)
+        self.counts = sum(
+            padded[di:di + height, dj:dj + width]
+            for di in range(3) for dj in range(3)
+        ) - self.board
+
+        # At first, player has found no mines
+        self.mines_found = set()
+
+    def is_mine(self, cell):
+        i, j = cell
+        return bool(self.board[i, j])
+
+    def nearby_mines(self, cell):
+        """
+        Returns the number of mines that are
+        within one row and column of a given cell,
+        not including the cell itself.
+        """
+        i, j = cell
+        return int(self.counts[i, j])
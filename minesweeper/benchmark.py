@@ -0,0 +1,68 @@
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+
+def play(height, width, mines, seed, engine=MinesweeperAI):
+    """
+    Plays one game with the AI until every safe cell is revealed.
+    Mines the AI steps on are marked and play continues, so that
+    every game exercises inference across the whole board.
+    Returns a dictionary with the number of `decisions`, `seconds` spent
+    deciding, mines `hit`, cells `deduced` by inference, and seconds
+    spent in `inference`.
+    """
+    random.seed(seed)
+    game = Minesweeper(height, width, mines)
+    ai = engine(height, width, mines, verbose=False)
+    stats = dict(decisions=0, seconds=0, hits=0, deduced=0, inference=0)
+    while True:
+        start = time.perf_counter()
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+        if move is None:
+            stats["seconds"] += time.perf_counter() - start
+            return stats
+        if game.is_mine(move):
+            stats["hits"] += 1
+            ai.mark_mine(move)
+        else:
+            known = len(ai.safes) + len(ai.mines)
+            inference = time.perf_counter()
+            ai.add_knowledge(move, game.nearby_mines(move))
+            stats["inference"] += time.perf_counter() - inference
+            stats["deduced"] += len(ai.safes) + len(ai.mines) - known
+        stats["seconds"] += time.perf_counter() - start
+        stats["decisions"] += 1
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    engines = [("subsets", MinesweeperAI)]
+    try:
+        from linear import LinearMinesweeperAI
+        engines.append(("linear", LinearMinesweeperAI))
+    except ImportError:
+        pass
+
+    print(f"{games} games on 30x16 with 99 mines")
+    print(f"{'engine':>8} {'clean':>6} {'deduced':>8} {'decisions/s':>12} "
+          f"{'deduced/ms':>11}")
+    for name, engine in engines:
+        total = dict(decisions=0, seconds=0, hits=0, deduced=0, inference=0)
+        clean = 0
+        for seed in range(games):
+            stats = play(16, 30, 99, seed, engine)
+            clean += stats["hits"] == 0
+            for key in total:
+                total[key] += stats[key]
+        print(f"{name:>8} {clean:>6} {total['deduced']:>8} "
+              f"{total['decisions'] / total['seconds']:>12.0f} "
+              f"{total['deduced'] / (total['inference'] * 1000):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
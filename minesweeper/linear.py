@@ -0,0 +1,101 @@
+import numpy as np
+
+from minesweeper import MinesweeperAI, cells_of
+
+# Coefficients smaller than this are treated as zero
+EPSILON = 1e-9
+
+
+def forced_cells(cells, sentences):
+    """
+    Finds every cell forced to be safe or a mine by a system of sentences.
+
+    Each sentence becomes a row of the 0/1 linear system A x = b over the
+    cells. Gaussian elimination brings the system to reduced row echelon
+    form, then each original and reduced row is checked against its bounds:
+    if b equals the sum of the positive coefficients, every cell with a
+    positive coefficient is a mine and every cell with a negative one is
+    safe, and symmetrically if b equals the sum of the negative ones.
+
+    Returns (safes, mines).
+    """
+    cells = list(cells)
+    index = {cell: i for i, cell in enumerate(cells)}
+    A = np.zeros((len(sentences), len(cells)))
+    b = np.zeros(len(sentences))
+    for row, sentence in enumerate(sentences):
+        for cell in cells_of(sentence.mask):
+            A[row, index[cell]] = 1
+        b[row] = sentence.count
+    system = np.hstack([A, b[:, None]])
+
+    # Reduce to row echelon form with partial pivoting
+    reduced = system.copy()
+    pivot_row = 0
+    for col in range(len(cells)):
+        if pivot_row == len(reduced):
+            break
+        pivot = pivot_row + np.argmax(np.abs(reduced[pivot_row:, col]))
+        if abs(reduced[pivot, col]) < EPSILON:
+            continue
+        reduced[[pivot_row, pivot]] = reduced[[pivot, pivot_row]]
+        reduced[pivot_row] /= reduced[pivot_row, col]
+        factors = reduced[:, col].copy()
+        factors[pivot_row] = 0
+        reduced -= np.outer(factors, reduced[pivot_row])
+        pivot_row += 1
+
+    # Bound reasoning on every row
+    rows = np.vstack([system, reduced[:pivot_row]])
+    coefficients, totals = rows[:, :-1], rows[:, -1]
+    positive = coefficients > EPSILON
+    negative = coefficients < -EPSILON
+    highest = np.where(positive, coefficients, 0).sum(axis=1)
+    lowest = np.where(negative, coefficients, 0).sum(axis=1)
+    at_highest = np.abs(totals - highest) < EPSILON
+    at_lowest = np.abs(totals - lowest) < EPSILON
+
+    mines = (positive & at_highest[:, None]) | (negative & at_lowest[:, None])
+    safes = (negative & at_highest[:, None]) | (positive & at_lowest[:, None])
+    return ({cells[i] for i in np.flatnonzero(safes.any(axis=0))},
+            {cells[i] for i in np.flatnonzero(mines.any(axis=0))})
+
+
+class LinearMinesweeperAI(MinesweeperAI):
+    """
+    Minesweeper player that replaces pairwise subset inference with
+    Gaussian elimination over each component of the frontier.
+    """
+
+    def __init__(self, height=8, width=8, mines=None, verbose=True):
+        super().__init__(height, width, mines, verbose)
+
+        # Components already solved without forcing any cell
+        self.solved = set()
+
+    def combine(self, sentence):
+        pass
+
+    def propagate(self):
+        """
+        Alternates simple propagation with a linear-algebra pass over
+        every frontier component until nothing new is concluded.
+        """
+        while True:
+            super().propagate()
+            safes, mines = set(), set()
+            for cells, sentences in self.components():
+                key = frozenset(self.signature(s) for s in sentences)
+                if key in self.solved:
+                    continue
+                forced = forced_cells(cells, sentences)
+                if not forced[0] and not forced[1]:
+                    self.solved.add(key)
+                safes |= forced[0]
+                mines |= forced[1]
+            if not safes and not mines:
+                return
+            for cell in mines:
+                self.mark_mine(cell)
+            for cell in safes:
+                self.mark_safe(cell)
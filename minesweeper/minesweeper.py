@@ -1,6 +1,9 @@
 import itertools
+import math
 import random
 
+from collections import deque
+
 
 class Minesweeper():
     """
@@ -84,19 +87,71 @@ class Minesweeper():
         return self.mines_found == self.mines
 
 
+# Bit index assigned to every cell that has appeared in a sentence
+CELL_BITS = dict()
+BIT_CELLS = []
+
+
+def cell_bit(cell):
+    """
+    Returns the bit representing `cell` in a sentence's mask.
+    """
+    if cell not in CELL_BITS:
+        CELL_BITS[cell] = len(BIT_CELLS)
+        BIT_CELLS.append(cell)
+    return 1 << CELL_BITS[cell]
+
+
+def cells_of(mask):
+    """
+    Yields the cells whose bits are set in `mask`.
+    """
+    while mask:
+        low = mask & -mask
+        yield BIT_CELLS[low.bit_length() - 1]
+        mask ^= low
+
+
 class Sentence():
     """
     Logical statement about a Minesweeper game
     A sentence consists of a set of board cells,
     and a count of the number of those cells which are mines.
+
+    The cells are stored as an integer bitset `mask`, so subset tests
+    and differences between sentences are single integer operations.
     """
 
+    __slots__ = ("mask", "count")
+
     def __init__(self, cells, count):
-        self.cells = set(cells)
+        self.mask = 0
+        for cell in cells:
+            self.mask |= cell_bit(cell)
         self.count = count
 
+    @classmethod
+    def from_mask(cls, mask, count):
+        """
+        Returns a sentence over the cells in bitset `mask`.
+        """
+        sentence = cls.__new__(cls)
+        sentence.mask = mask
+        sentence.count = count
+        return sentence
+
+    @property
+    def cells(self):
+        return set(cells_of(self.mask))
+
+    @cells.setter
+    def cells(self, cells):
+        self.mask = 0
+        for cell in cells:
+            self.mask |= cell_bit(cell)
+
     def __eq__(self, other):
-        return self.cells == other.cells and self.count == other.count
+        return self.mask == other.mask and self.count == other.count
 
     def __str__(self):
         return f"{self.cells} = {self.count}"
@@ -106,7 +161,7 @@ class Sentence():
         Returns the set of all cells in self.cells known to be mines.
         """
         if self.count != 0:
-            if len(self.cells) == self.count: 
+            if self.mask.bit_count() == self.count:
                 return self.cells
         return set()
 
@@ -115,7 +170,6 @@ class Sentence():
         Returns the set of all cells in self.cells known to be safe.
         """
         if self.count == 0:
-            #print(self.cells)
             return self.cells
         return set()
 
@@ -127,8 +181,9 @@ class Sentence():
          but still represents a logically correct sentence given that cell is known to be a mine.
         -If cell is not in the sentence, then no action is necessary.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        bit = CELL_BITS.get(cell)
+        if bit is not None and self.mask >> bit & 1:
+            self.mask ^= 1 << bit
             self.count -= 1
 
     def mark_safe(self, cell):
@@ -139,8 +194,9 @@ class Sentence():
          but still represents a logically correct sentence given that cell is known to be safe.
         -If cell is not in the sentence, then no action is necessary.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        bit = CELL_BITS.get(cell)
+        if bit is not None and self.mask >> bit & 1:
+            self.mask ^= 1 << bit
 
 
 class MinesweeperAI():
@@ -148,12 +204,18 @@ class MinesweeperAI():
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=None, verbose=True):
 
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Whether to print each move as knowledge is added
+        self.verbose = verbose
+
+        # Total number of mines on the board, if known
+        self.total_mines = mines
+
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
@@ -161,9 +223,27 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Sentences about the game known to be true, keyed by id
+        self.sentences = dict()
+
+        # Map each cell to the sentences that contain it, keyed by id
+        self.containing = dict()
 
+        # Cells and count of every sentence, to skip duplicates
+        self.signatures = set()
+
+        # Sentences waiting to be checked for new inferences
+        self.worklist = deque()
+
+        # Enumerated mine configurations of frontier components
+        self.enumerations = dict()
+
+    @property
+    def knowledge(self):
+        """
+        List of sentences about the game known to be true.
+        """
+        return list(self.sentences.values())
 
     def mark_mine(self, cell):
         """
@@ -171,8 +251,9 @@ class MinesweeperAI():
         to mark that cell as a mine as well.
         """
         self.mines.add(cell)
-        for sentence in self.knowledge:
+        for sentence in self.detach(cell):
             sentence.mark_mine(cell)
+            self.add_sentence(sentence)
 
     def mark_safe(self, cell):
         """
@@ -180,8 +261,89 @@ class MinesweeperAI():
         to mark that cell as safe as well.
         """
         self.safes.add(cell)
-        for sentence in self.knowledge:
+        for sentence in self.detach(cell):
             sentence.mark_safe(cell)
+            self.add_sentence(sentence)
+
+    def signature(self, sentence):
+        return (sentence.mask, sentence.count)
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge base, unless it is empty
+        or already known, and queues it for inference.
+        """
+        if not sentence.mask or self.signature(sentence) in self.signatures:
+            return
+        self.sentences[id(sentence)] = sentence
+        self.signatures.add(self.signature(sentence))
+        for cell in cells_of(sentence.mask):
+            self.containing.setdefault(cell, dict())[id(sentence)] = sentence
+        self.worklist.append(sentence)
+
+    def detach(self, cell):
+        """
+        Removes every sentence containing `cell` from the knowledge base
+        and returns them, so they can be updated and added back
+        with `add_sentence`.
+        """
+        sentences = list(self.containing.pop(cell, dict()).values())
+        for sentence in sentences:
+            del self.sentences[id(sentence)]
+            self.signatures.discard(self.signature(sentence))
+            for other in cells_of(sentence.mask):
+                if other != cell:
+                    del self.containing[other][id(sentence)]
+        return sentences
+
+    def propagate(self):
+        """
+        Draws inferences from queued sentences until no new
+        safe cells, mines or sentences can be concluded.
+        """
+        while self.worklist:
+            sentence = self.worklist.popleft()
+            if self.sentences.get(id(sentence)) is not sentence:
+                continue
+
+            # All cells are mines, or all cells are safe
+            if sentence.known_mines():
+                for cell in sentence.known_mines().copy():
+                    self.mark_mine(cell)
+                continue
+            if sentence.known_safes():
+                for cell in sentence.known_safes().copy():
+                    self.mark_safe(cell)
+                continue
+
+            self.combine(sentence)
+
+    def combine(self, sentence):
+        """
+        Infers new sentences from `sentence` and every sentence that is
+        a subset or superset of it.
+        """
+        mask = sentence.mask
+        cells = list(cells_of(mask))
+
+        # Supersets of this sentence contain its rarest cell
+        cell = min(cells, key=lambda c: len(self.containing[c]))
+        supersets = [other for other in self.containing[cell].values()
+                     if other is not sentence and mask & ~other.mask == 0]
+
+        # Subsets of this sentence can be found under any of its cells
+        subsets = dict()
+        for cell in cells:
+            for key, other in self.containing[cell].items():
+                if other is not sentence and other.mask & ~mask == 0:
+                    subsets[key] = other
+
+        for other in supersets:
+            self.add_sentence(Sentence.from_mask(
+                other.mask ^ mask, other.count - sentence.count))
+        for other in subsets.values():
+            self.add_sentence(Sentence.from_mask(
+                mask ^ other.mask, sentence.count - other.count))
 
     def add_knowledge(self, cell, count):
         """
@@ -204,7 +366,8 @@ class MinesweeperAI():
 
         undefined = set()
         count_ = 0
-        print(f"current cell {cell}")
+        if self.verbose:
+            print(f"current cell {cell}")
         for i in range(cell[0]-1, cell[0]+2):
             for j in range(cell[1] - 1, cell[1]+2):
                 cell_ = (i,j)                
@@ -215,25 +378,8 @@ class MinesweeperAI():
                     if cell_ not in self.safes and cell_ not in self.mines: 
                         undefined.add(cell_)
 
-        local = Sentence(undefined, count - count_)
-        self.knowledge.append(local)
-        
-        for i in self.knowledge:
-            if i.known_mines():
-                for cell_ in i.known_mines().copy():
-                    self.mark_mine(cell_)
-            if i.known_safes():
-                for cell_ in i.known_safes().copy():
-                    self.mark_safe(cell_)
-
-        for i in self.knowledge:
-            if i.count > 0:            
-                if local != i and local.count > 0: 
-                    if local.cells.issubset(i.cells):
-                        subset = i.cells.difference(local.cells)
-                        #print(f"i = {i}, local = {local}, subset = {subset}")
-                        self.knowledge.append(Sentence(subset, i.count - local.count))
-
+        self.add_sentence(Sentence(undefined, count - count_))
+        self.propagate()
 
     def make_safe_move(self):
         """
@@ -252,9 +398,10 @@ class MinesweeperAI():
     def make_random_move(self):
         """
         Returns a move to make on the Minesweeper board.
-        Should choose randomly among cells that:
+        Chooses among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        the one least likely to be a mine, breaking ties randomly.
         """
         moves = []
         for i in range(self.height):
@@ -262,7 +409,182 @@ class MinesweeperAI():
                 cell = (i,j)
                 if cell not in self.mines and cell not in self.moves_made:
                     moves.append(cell)
-        if len(moves) != 0:
-            return random.choice(moves)
+        if len(moves) == 0:
+            return None
+
+        probabilities = self.mine_probabilities(moves)
+        lowest = min(probabilities.values())
+        return random.choice([cell for cell in moves
+                              if probabilities[cell] == lowest])
+
+    def components(self):
+        """
+        Splits the knowledge base into independent components:
+        groups of sentences linked by shared cells.
+        Returns a list of (cells, sentences) pairs.
+        """
+        components = []
+        seen = set()
+        for start in self.sentences:
+            if start in seen:
+                continue
+            seen.add(start)
+            stack = [self.sentences[start]]
+            sentences = []
+            cells = set()
+            while stack:
+                sentence = stack.pop()
+                sentences.append(sentence)
+                for cell in cells_of(sentence.mask):
+                    if cell in cells:
+                        continue
+                    cells.add(cell)
+                    for key, other in self.containing[cell].items():
+                        if key not in seen:
+                            seen.add(key)
+                            stack.append(other)
+            components.append((cells, sentences))
+        return components
+
+    def enumerate_component(self, cells, sentences):
+        """
+        Counts the mine configurations of a component consistent with its
+        sentences. Returns (totals, per_cell) where totals[m] is the number
+        of configurations with m mines and per_cell[m][cell] the number of
+        those in which `cell` is a mine.
+        """
+        # Assign cells in breadth-first order so sentences close early
+        order = []
+        placed = set()
+        for sentence in sentences:
+            for cell in cells_of(sentence.mask):
+                if cell not in placed:
+                    placed.add(cell)
+                    order.append(cell)
+        constraints = [[sentence.count, sentence.mask.bit_count()]
+                       for sentence in sentences]
+        touching = {cell: [] for cell in cells}
+        for k, sentence in enumerate(sentences):
+            for cell in cells_of(sentence.mask):
+                touching[cell].append(k)
+
+        totals = [0] * (len(cells) + 1)
+        per_cell = [dict.fromkeys(cells, 0) for _ in range(len(cells) + 1)]
+        mines = []
+
+        def assign(index):
+            if index == len(order):
+                totals[len(mines)] += 1
+                counts = per_cell[len(mines)]
+                for cell in mines:
+                    counts[cell] += 1
+                return
+            cell = order[index]
+            for is_mine in (True, False):
+
+                # Each constraint tracks mines still needed and cells left
+                feasible = True
+                for k in touching[cell]:
+                    constraint = constraints[k]
+                    constraint[1] -= 1
+                    if is_mine:
+                        constraint[0] -= 1
+                    if constraint[0] < 0 or constraint[0] > constraint[1]:
+                        feasible = False
+                if feasible:
+                    if is_mine:
+                        mines.append(cell)
+                    assign(index + 1)
+                    if is_mine:
+                        mines.pop()
+                for k in touching[cell]:
+                    constraints[k][1] += 1
+                    if is_mine:
+                        constraints[k][0] += 1
+
+        assign(0)
+        return totals, per_cell
+
+    def mine_probabilities(self, moves):
+        """
+        Returns the probability that each cell in `moves` is a mine, given
+        the knowledge base and, if known, the total number of mines.
+        Configurations are weighted by the number of ways to place the
+        remaining mines among the cells no sentence mentions.
+        """
+        components = []
+        enumerations = dict()
+        for cells, sentences in self.components():
+            key = frozenset(self.signature(s) for s in sentences)
+            if key in self.enumerations:
+                enumerations[key] = self.enumerations[key]
+            elif key not in enumerations:
+                enumerations[key] = self.enumerate_component(cells, sentences)
+            components.append((cells, enumerations[key]))
+
+        # Keep only enumerations of components that still exist
+        self.enumerations = enumerations
+
+        frontier = set().union(*[cells for cells, _ in components])
+        others = len([cell for cell in moves
+                      if cell not in frontier and cell not in self.safes])
+        if self.total_mines is None:
+            remaining = None
         else:
-            return None      
+            remaining = self.total_mines - len(self.mines)
+
+        def ways(mines):
+            """Ways to place the remaining mines off the frontier."""
+            if remaining is None:
+                return 1
+            rest = remaining - mines
+            return math.comb(others, rest) if 0 <= rest <= others else 0
+
+        def convolve(a, b):
+            result = [0] * (len(a) + len(b) - 1)
+            for i, x in enumerate(a):
+                if x:
+                    for j, y in enumerate(b):
+                        result[i + j] += x * y
+            return result
+
+        probabilities = dict()
+        for i, (cells, (totals, per_cell)) in enumerate(components):
+
+            # Distribution of mines over every other component
+            others_totals = [1]
+            for j, (_, (other, _)) in enumerate(components):
+                if j != i:
+                    others_totals = convolve(others_totals, other)
+            weights = [
+                sum(count * ways(m + s) for s, count in enumerate(others_totals))
+                for m in range(len(totals))
+            ]
+            total = sum(totals[m] * weights[m] for m in range(len(totals)))
+            for cell in cells:
+                mine = sum(per_cell[m][cell] * weights[m]
+                           for m in range(len(totals)))
+                probabilities[cell] = mine / total if total else 1
+
+        # Cells off the frontier share the expected remaining mines
+        if others:
+            if remaining is None:
+                if probabilities:
+                    p = sum(probabilities.values()) / len(probabilities)
+                else:
+                    p = 0.5
+            else:
+                everything = [1]
+                for _, (totals, _) in components:
+                    everything = convolve(everything, totals)
+                total = sum(count * ways(s) for s, count in enumerate(everything))
+                expected = sum(count * ways(s) * (remaining - s)
+                               for s, count in enumerate(everything))
+                p = expected / total / others if total else 1
+            for cell in moves:
+                if cell not in frontier:
+                    probabilities[cell] = p
+        for cell in moves:
+            if cell in self.safes:
+                probabilities[cell] = 0
+        return probabilities
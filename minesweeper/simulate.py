@@ -0,0 +1,104 @@
+import argparse
+import json
+import math
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+
+def play(height, width, mines, seed, array=False):
+    """
+    Plays one game with the AI, stopping at the first mine.
+    If `array` is True the board is backed by NumPy arrays.
+    Returns (whether the AI won, list of per-decision latencies).
+    """
+    random.seed(seed)
+    if array:
+        from arrayboard import ArrayMinesweeper
+        game = ArrayMinesweeper(height, width, mines)
+    else:
+        game = Minesweeper(height, width, mines)
+    ai = MinesweeperAI(height, width, mines, verbose=False)
+    latencies = []
+    revealed = 0
+    while revealed < height * width - mines:
+        start = time.perf_counter()
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+        if move is None or game.is_mine(move):
+            latencies.append(time.perf_counter() - start)
+            return False, latencies
+        ai.add_knowledge(move, game.nearby_mines(move))
+        latencies.append(time.perf_counter() - start)
+        revealed += 1
+    return True, latencies
+
+
+def percentile(values, p):
+    """
+    Returns the `p`th percentile of `values` by the nearest-rank method.
+    """
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def simulate(games, height=8, width=8, mines=8, seed=0, processes=None,
+             array=False):
+    """
+    Plays `games` games across a pool of worker processes and returns
+    a report of win rate, moves per second and decision latencies.
+    """
+    start = time.perf_counter()
+    seeds = range(seed, seed + games)
+    with ProcessPoolExecutor(processes) as executor:
+        results = list(executor.map(play, [height] * games, [width] * games,
+                                    [mines] * games, seeds, [array] * games,
+                                    chunksize=16))
+    elapsed = time.perf_counter() - start
+
+    wins = sum(won for won, _ in results)
+    latencies = [latency for _, game in results for latency in game]
+    thinking = sum(latencies)
+    return {
+        "board": {"height": height, "width": width, "mines": mines},
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else None,
+        "moves": len(latencies),
+        "moves_per_second": len(latencies) / thinking if thinking else None,
+        "wall_seconds": elapsed,
+        "latency_ms": {
+            f"p{p}": percentile(latencies, p) * 1000 if latencies else None
+            for p in (50, 90, 99, 100)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Minesweeper AI simulator")
+    parser.add_argument("-n", "--games", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=8)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--mines", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-p", "--processes", type=int, default=None)
+    parser.add_argument("--array", action="store_true",
+                        help="use the NumPy-backed board")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = simulate(args.games, args.height, args.width, args.mines,
+                      args.seed, args.processes, args.array)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
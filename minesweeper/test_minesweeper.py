@@ -0,0 +1,20 @@
+from minesweeper import MinesweeperAI, Sentence
+
+
+def infer(*sentences):
+    """
+    Adds sentences given as (cells, count) in order to a new AI
+    and returns its safe cells.
+    """
+    ai = MinesweeperAI(8, 8, verbose=False)
+    for cells, count in sentences:
+        ai.add_sentence(Sentence(cells, count))
+        ai.propagate()
+    return ai.safes
+
+
+def test_subset_inference_independent_of_order():
+    subset = ({(0, 0), (0, 1)}, 1)
+    superset = ({(0, 0), (0, 1), (0, 2)}, 1)
+    assert (0, 2) in infer(subset, superset)
+    assert (0, 2) in infer(superset, subset)
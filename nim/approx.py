@@ -0,0 +1,218 @@
+import itertools
+import random
+
+from bisect import bisect_left
+
+import numpy as np
+
+from nim import Nim, NimAI
+
+
+class SymmetricNimAI(NimAI):
+    """
+    NimAI that shares Q-values between states that are permutations of
+    each other.
+
+    Keys of `self.q` are canonical: the state is sorted, and the action
+    takes from the first pile of its size in the sorted state, so all
+    piles of one size share a single action.
+    """
+
+    def canonical(self, state, action):
+        """
+        Returns the canonical `(state, action)` key of an action.
+        """
+        i, j = action
+        ordered = tuple(sorted(state))
+        return (ordered, (bisect_left(ordered, state[i]), j))
+
+    def canonical_actions(self, ordered):
+        """
+        Returns the canonical actions available in the sorted state
+        `ordered`.
+        """
+        actions = []
+        for i, pile in enumerate(ordered):
+            if pile and (i == 0 or ordered[i - 1] != pile):
+                actions.extend((i, j) for j in range(1, pile + 1))
+        return actions
+
+    def get_q_value(self, state, action):
+        """
+        Return the Q-value shared by every permutation of `state`
+        and `action`, or 0 if there is none yet.
+        """
+        return self.q.get(self.canonical(state, action), 0)
+
+    def update_q_value(self, state, action, old_q, reward, future_rewards):
+        """
+        Update the shared Q-value of `state` and `action`,
+        as in `NimAI.update_q_value`.
+        """
+        self.q[self.canonical(state, action)] = \
+            old_q + self.alpha * (reward + future_rewards - old_q)
+
+    def best_future_reward(self, state):
+        """
+        Return the highest Q-value available in `state`, or 0 if that
+        is negative or there are no available actions.
+        """
+        ordered = tuple(sorted(state))
+        reward = 0
+        for action in self.canonical_actions(ordered):
+            reward = max(self.q.get((ordered, action), 0), reward)
+        return reward
+
+    def choose_action(self, state, epsilon=True):
+        """
+        Given a state `state`, return an action `(i, j)` to take,
+        as in `NimAI.choose_action`.
+        """
+        if epsilon:
+            return random.choice(sorted(Nim.available_actions(state)))
+        ordered = tuple(sorted(state))
+        i, j = max(self.canonical_actions(ordered),
+                   key=lambda action: self.q.get((ordered, action), 0))
+        return (state.index(ordered[i]), j)
+
+    def entries(self):
+        """
+        Yields `(state, action, q)` for every permutation of the state
+        and action of every Q-value in `self.q`.
+        """
+        for (ordered, (i, j)), q in self.q.items():
+            for state in sorted(set(itertools.permutations(ordered))):
+                for k, pile in enumerate(state):
+                    if pile == ordered[i]:
+                        yield state, (k, j), q
+
+
+class LinearNimAI(NimAI):
+    """
+    NimAI that approximates Q-values with a linear function of the piles
+    each action leaves, so that its memory does not grow with the number
+    of piles or with the states visited.
+
+    The features of the piles left are how many piles have each size,
+    as a fraction of the number of piles, and a constant. They do not
+    encode the nim-sum, so the model has to learn what it can of the
+    game from them.
+    """
+
+    def __init__(self, initial=[1, 3, 5, 7], alpha=0.1, epsilon=0.1):
+        """
+        Initialize AI with zero weights for games starting from the
+        piles `initial`. Each update moves the Q-value of the action
+        a fraction `alpha` of the way to its new estimate.
+        """
+        super().__init__(alpha, epsilon)
+        self.sizes = max(initial) + 1
+        self.weights = np.zeros(self.sizes + 1)
+
+    def features(self, state, actions):
+        """
+        Returns the features of the piles left by every action in
+        `actions` from `state`, one row per action.
+        """
+        taken = np.array([state[i] for i, _ in actions])
+        left = taken - np.array([j for _, j in actions])
+        rows = np.arange(len(actions))
+
+        features = np.zeros((len(actions), self.sizes + 1))
+        features[:, :self.sizes] = np.bincount(state, minlength=self.sizes)
+        features[rows, taken] -= 1
+        features[rows, left] += 1
+        features[:, :self.sizes] /= len(state)
+        features[:, -1] = 1
+        return features
+
+    def q_values(self, state):
+        """
+        Returns (available actions in `state`, their Q-values).
+        """
+        actions = [(i, j) for i, pile in enumerate(state)
+                   for j in range(1, pile + 1)]
+        if not actions:
+            return actions, np.zeros(0)
+        return actions, self.features(state, actions) @ self.weights
+
+    def get_q_value(self, state, action):
+        """
+        Return the approximate Q-value of `state` and `action`.
+        """
+        return float(self.features(state, [action])[0] @ self.weights)
+
+    def update_q_value(self, state, action, old_q, reward, future_rewards):
+        """
+        Move the weights so that the Q-value of `state` and `action`
+        goes a fraction `alpha` of the way to its new estimate.
+        """
+        features = self.features(state, [action])[0]
+        self.weights += (self.alpha * (reward + future_rewards - old_q) *
+                         features / (features @ features))
+
+    def best_future_reward(self, state):
+        """
+        Return the highest Q-value available in `state`, clipped to
+        the range of rewards [0, 1] as in `NimAI.best_future_reward`.
+        """
+        _, values = self.q_values(state)
+        return min(max(float(values.max()), 0), 1) if len(values) else 0
+
+    def choose_action(self, state, epsilon=True):
+        """
+        Given a state `state`, return an action `(i, j)` to take,
+        as in `NimAI.choose_action`.
+        """
+        if epsilon:
+            return random.choice(sorted(Nim.available_actions(state)))
+        actions, values = self.q_values(state)
+        return actions[int(values.argmax())]
+
+    def entries(self):
+        """
+        LinearNimAI has no table of Q-values to list or checkpoint.
+        """
+        raise NotImplementedError("LinearNimAI has no Q-table entries")
+
+    def nbytes(self):
+        """
+        Returns the number of bytes used by the weights.
+        """
+        return self.weights.nbytes
+
+
+class NimSumBaselineAI(LinearNimAI):
+    """
+    Oracle-shaped baseline for LinearNimAI, not a general approximation.
+
+    Its features are one-hot classes of the piles an action leaves: the
+    nim-sum when some pile has more than one object, or the parity of
+    the piles left otherwise. These are exactly the quantities the
+    optimal misère strategy looks at, so its quality only shows how
+    well training recovers values the representation already separates.
+    """
+
+    def __init__(self, initial=[1, 3, 5, 7], alpha=0.5, epsilon=0.1):
+        super().__init__(initial, alpha, epsilon)
+        self.sums = 1 << max(initial).bit_length()
+        self.weights = np.zeros(self.sums + 2)
+
+    def features(self, state, actions):
+        """
+        Returns the one-hot class of the piles left by every action in
+        `actions` from `state`, one row per action.
+        """
+        piles = np.array(state)
+        index = np.array([i for i, _ in actions])
+        taken = piles[index]
+        left = taken - np.array([j for _, j in actions])
+
+        total = np.bitwise_xor.reduce(piles) ^ taken ^ left
+        large = (piles > 1).sum() - (taken > 1) + (left > 1)
+        ones = (piles == 1).sum() - (taken == 1) + (left == 1)
+        classes = np.where(large > 0, total, self.sums + ones % 2)
+
+        features = np.zeros((len(actions), len(self.weights)))
+        features[np.arange(len(actions)), classes] = 1
+        return features
@@ -0,0 +1,196 @@
+import random
+import time
+
+import numpy as np
+
+from nim import NimAI
+
+
+class Encoding():
+    """
+    Integer encoding of the states and actions of Nim games that start
+    from the piles `initial`.
+
+    A state is encoded in mixed radix, with pile `i` as the digit of
+    radix `initial[i] + 1` and the first pile least significant, so
+    the empty board is state 0 and the initial board the last state.
+    Actions `(i, j)` are numbered pile by pile, then by count.
+    """
+
+    def __init__(self, initial=[1, 3, 5, 7]):
+        self.initial = list(initial)
+        self.radices = np.array(self.initial, dtype=np.int64) + 1
+        self.strides = np.cumprod(np.concatenate(([1], self.radices[:-1])))
+        self.num_states = int(np.prod(self.radices))
+        self.num_actions = sum(self.initial)
+        self.start = self.num_states - 1
+
+        # Pile and count removed by every action
+        self.pile_of = np.repeat(np.arange(len(self.initial)), self.initial)
+        self.count_of = np.concatenate(
+            [np.arange(1, pile + 1) for pile in self.initial]
+        ).astype(np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.initial)[:-1]))
+        self.stride_list = self.strides.tolist()
+        self.offset_list = self.offsets.tolist()
+
+        # Piles of every state, and which actions are available in it
+        states = np.arange(self.num_states)
+        self.piles = states[:, None] // self.strides % self.radices
+        self.valid = self.piles[:, self.pile_of] >= self.count_of
+
+        # State reached by every available action, 0 where unavailable
+        self.successor = np.where(
+            self.valid,
+            states[:, None] - self.count_of * self.strides[self.pile_of],
+            0
+        )
+
+        # Available actions of every state first, in action order
+        self.num_valid = self.valid.sum(axis=1)
+        self.ordered = np.argsort(~self.valid, axis=1, kind="stable")
+
+    def state(self, piles):
+        """
+        Returns the integer encoding of the list of `piles`.
+        """
+        return sum(pile * stride
+                   for pile, stride in zip(piles, self.stride_list))
+
+    def action(self, action):
+        """
+        Returns the integer encoding of the action `(i, j)`.
+        """
+        i, j = action
+        return self.offset_list[i] + j - 1
+
+    def contains(self, piles):
+        """
+        Returns True if the list of `piles` is a state of this encoding.
+        """
+        return len(piles) == len(self.initial) and \
+            all(pile <= limit for pile, limit in zip(piles, self.initial))
+
+    def decode_state(self, state):
+        """
+        Returns the list of piles encoded by `state`.
+        """
+        return self.piles[state].tolist()
+
+    def decode_action(self, action):
+        """
+        Returns the action `(i, j)` encoded by `action`.
+        """
+        return int(self.pile_of[action]), int(self.count_of[action])
+
+
+def play_batches(encoding, q, visits, n, batch, alpha, rng):
+    """
+    Plays `n` random self-play games, `batch` games at a time, updating
+    the flat Q-table `q` in place and counting in `visits` how many
+    updates each `(state, action)` received.
+
+    Updates that several games make to the same `(state, action)` in
+    one step are averaged into one step of size `alpha`.
+    """
+    width = encoding.num_actions
+    for played in range(0, n, batch):
+        games = min(batch, n - played)
+        state = np.full(games, encoding.start)
+
+        # Last key moved from by each player, -1 before their first move
+        last = np.full((2, games), -1)
+        player = 0
+
+        # Every game in a batch has made the same number of moves,
+        # so all of them have the same player to move
+        while len(state):
+
+            # Make a random available move in every game
+            choice = (rng.random(len(state)) *
+                      encoding.num_valid[state]).astype(np.int64)
+            action = encoding.ordered[state, choice]
+            key = state * width + action
+            new_state = encoding.successor[state, action]
+            last[player] = key
+            player = 1 - player
+
+            # The player who moved into an empty board loses, the other
+            # wins, and otherwise the waiting player gets no reward yet
+            over = new_state == 0
+            waiting = last[player]
+            won = over & (waiting >= 0)
+            pending = ~over & (waiting >= 0)
+            keys = np.concatenate((key[over], waiting[won], waiting[pending]))
+            best_future = np.maximum(
+                q.reshape(-1, width)[new_state[pending]].max(axis=1), 0
+            )
+            targets = np.concatenate((np.full(over.sum(), -1.0),
+                                      np.full(won.sum(), 1.0),
+                                      best_future))
+
+            deltas = targets - q[keys]
+            unique, inverse, counts = np.unique(
+                keys, return_inverse=True, return_counts=True
+            )
+            q[unique] += alpha * np.bincount(inverse, deltas) / counts
+            visits[unique] += counts
+
+            # Drop the games that are over
+            state = new_state[~over]
+            last = last[:, ~over]
+
+
+def to_ai(encoding, q, visits, alpha=0.5, epsilon=0.1, dense=False):
+    """
+    Returns a NimAI holding the flat Q-table `q`, with dict entries for
+    every `(state, action)` that has `visits`, or a DenseNimAI sharing
+    the array if `dense` is True.
+    """
+    width = encoding.num_actions
+    if dense:
+        from dense import DenseNimAI
+        return DenseNimAI(encoding.initial, alpha, epsilon,
+                          q.reshape(-1, width))
+
+    ai = NimAI(alpha=alpha, epsilon=epsilon)
+    for key in np.flatnonzero(visits):
+        state, action = divmod(int(key), width)
+        ai.q[(tuple(encoding.decode_state(state)),
+              encoding.decode_action(action))] = float(q[key])
+    return ai
+
+
+def train_batch(n, initial=[1, 3, 5, 7], batch=1024,
+                alpha=0.5, epsilon=0.1, dense=False, player=None):
+    """
+    Train an AI by playing `n` games against itself, `batch` games at
+    a time, with Q-values in a NumPy array indexed by encoded state and
+    action. As in `train`, every move is chosen at random.
+
+    If `dense` is True the AI is a DenseNimAI sharing the array.
+    If `player` is given, training resumes from its Q-values.
+    Returns (trained NimAI, games per second).
+    """
+    start = time.perf_counter()
+    encoding = Encoding(initial)
+    rng = np.random.default_rng(random.getrandbits(64))
+
+    # Unavailable actions keep a Q-value of 0, so that the row maximum
+    # clipped at 0 matches `NimAI.best_future_reward`
+    size = encoding.num_states * encoding.num_actions
+    q = np.zeros(size)
+    visits = np.zeros(size, dtype=np.int64)
+    if player is not None:
+        for state, action, value in player.entries():
+            if not encoding.contains(state):
+                continue
+            key = (encoding.state(state) * encoding.num_actions +
+                   encoding.action(action))
+            q[key] = value
+            visits[key] = 1
+    play_batches(encoding, q, visits, n, batch, alpha, rng)
+
+    ai = to_ai(encoding, q, visits, alpha, epsilon, dense)
+    ai.games = n + (player.games if player is not None else 0)
+    return ai, n / (time.perf_counter() - start)
@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import timeit
+
+from approx import LinearNimAI, NimSumBaselineAI, SymmetricNimAI
+from batch import Encoding, train_batch
+from nim import NimAI, train
+from oracle import evaluate, sample_agreement, win_rate, winning
+from parallel import train_parallel
+
+
+def throughput(games=10000, batch_games=1000000):
+    """
+    Prints training games per second of `train` and of `train_batch`
+    at several batch sizes.
+    """
+    start = time.perf_counter()
+    train(games, verbose=False)
+    serial = games / (time.perf_counter() - start)
+    print(f"{'trainer':>14} {'games':>8} {'games/s':>10} {'speedup':>8}")
+    print(f"{'train':>14} {games:>8} {serial:>10.0f} {1:>7.1f}x")
+    for batch in (64, 1024, 16384):
+        _, rate = train_batch(batch_games, batch=batch)
+        print(f"{f'batch {batch}':>14} {batch_games:>8} {rate:>10.0f} "
+              f"{rate / serial:>7.1f}x")
+
+
+def dict_nbytes(q):
+    """
+    Returns the bytes used by a dict Q-table, its keys and its values.
+    """
+    total = sys.getsizeof(q)
+    for (state, action), value in q.items():
+        total += sum(map(sys.getsizeof, ((state, action), state, action,
+                                         value)))
+    return total
+
+
+def memory(games=100000, number=10000):
+    """
+    Compares memory and lookup time of the dict and dense Q-tables
+    after `games` batch training games, for growing piles.
+    """
+    print(f"{'piles':>16} {'entries':>8} {'dict':>10} {'dense':>10} "
+          f"{'dict best':>10} {'dense best':>11}")
+    for initial in ([1, 3, 5, 7], [2, 4, 6, 8], [3, 5, 7, 9, 11]):
+        ai, _ = train_batch(games, initial)
+        dense, _ = train_batch(games, initial, dense=True)
+        times = [
+            timeit.timeit(lambda: table.best_future_reward(initial),
+                          number=number) / number * 1e6
+            for table in (ai, dense)
+        ]
+        print(f"{str(initial):>16} {len(ai.q):>8} "
+              f"{dict_nbytes(ai.q) / 1024:>8.0f}KB "
+              f"{dense.nbytes() / 1024:>8.0f}KB "
+              f"{times[0]:>8.2f}us {times[1]:>9.2f}us")
+
+
+def parallel_convergence(games=200000):
+    """
+    Prints wall time and win rate against the oracle of `train_batch`
+    and of `train_parallel` across process counts and merge methods.
+    """
+    start = time.perf_counter()
+    ai, _ = train_batch(games, dense=True)
+    serial = time.perf_counter() - start
+    print(f"{games} games")
+    print(f"{'trainer':>16} {'time':>8} {'speedup':>8} {'win rate':>9}")
+    print(f"{'serial':>16} {serial:>7.2f}s {1:>7.2f}x {win_rate(ai):>9.3f}")
+    for method in ("average", "visits"):
+        for processes in range(1, max(os.cpu_count() or 1, 2) + 1):
+            start = time.perf_counter()
+            ai, _ = train_parallel(games, processes=processes,
+                                   method=method, dense=True)
+            seconds = time.perf_counter() - start
+            print(f"{f'{method} x{processes}':>16} {seconds:>7.2f}s "
+                  f"{serial / seconds:>7.2f}x {win_rate(ai):>9.3f}")
+
+
+def scalar_agreement(ai, initial=[1, 3, 5, 7]):
+    """
+    Computes `evaluate`'s agreement one state at a time with the
+    scalar oracle. Returns (agreement, states per second).
+    """
+    start = time.perf_counter()
+    encoding = Encoding(initial)
+    agreed = total = 0
+    for state in range(1, encoding.num_states):
+        piles = encoding.decode_state(state)
+        if winning(piles):
+            i, j = ai.choose_action(piles, epsilon=False)
+            piles[i] -= j
+            agreed += not winning(piles)
+            total += 1
+    seconds = time.perf_counter() - start
+    return agreed / total, (encoding.num_states - 1) / seconds
+
+
+def quality():
+    """
+    Prints training time and agreement with the oracle of every
+    trainer, and evaluation throughput.
+    """
+    trainers = [
+        ("train", 10000, lambda n: train(n, verbose=False)),
+        ("train", 100000, lambda n: train(n, verbose=False)),
+        ("batch", 100000, lambda n: train_batch(n)[0]),
+        ("batch", 1000000, lambda n: train_batch(n)[0]),
+        ("parallel", 1000000, lambda n: train_parallel(n)[0])
+    ]
+    print(f"{'trainer':>9} {'games':>8} {'time':>8} {'agreement':>10} "
+          f"{'agreement/s':>11}")
+    for name, games, trainer in trainers:
+        start = time.perf_counter()
+        ai = trainer(games)
+        seconds = time.perf_counter() - start
+        agreement = evaluate(ai)["agreement"]
+        print(f"{name:>9} {games:>8} {seconds:>7.2f}s {agreement:>10.3f} "
+              f"{agreement / seconds:>11.3f}")
+
+    initial = [3, 5, 7, 9, 11]
+    ai, _ = train_batch(100000, initial, dense=True)
+    report = evaluate(ai, initial)
+    _, scalar = scalar_agreement(ai, initial)
+    print(f"evaluating {report['states']} states of {initial}: "
+          f"{report['states_per_second']:.0f} states/s vectorized, "
+          f"{scalar:.0f} states/s scalar")
+
+
+def large(games=500):
+    """
+    Compares memory, training throughput and sampled agreement of the
+    dict, symmetric and linear Q representations as piles grow.
+
+    Every AI explores with uniformly random moves, as `NimAI` does.
+    The nim-sum baseline's features encode the optimal strategy, so
+    its agreement is a reference, not a measure of learning.
+    """
+    print(f"{'piles':>10} {'ai':>10} {'entries':>8} {'memory':>10} "
+          f"{'games/s':>8} {'agreement':>10}")
+    for initial in ([1, 3, 5, 7], [5] * 6, [20] * 8, [100] * 10):
+        ais = [("dict", NimAI()), ("symmetric", SymmetricNimAI()),
+               ("linear", LinearNimAI(initial)),
+               ("baseline", NimSumBaselineAI(initial))]
+        for name, ai in ais:
+            start = time.perf_counter()
+            train(games, verbose=False, player=ai, initial=initial)
+            rate = games / (time.perf_counter() - start)
+            if isinstance(ai, LinearNimAI):
+                entries, nbytes = len(ai.weights), ai.nbytes()
+            else:
+                entries, nbytes = len(ai.q), dict_nbytes(ai.q)
+            print(f"{f'{len(initial)}x{max(initial)}':>10} {name:>10} "
+                  f"{entries:>8} {nbytes / 1024:>8.1f}KB {rate:>8.0f} "
+                  f"{sample_agreement(ai, initial):>10.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "memory":
+        memory()
+    elif len(sys.argv) > 1 and sys.argv[1] == "parallel":
+        parallel_convergence()
+    elif len(sys.argv) > 1 and sys.argv[1] == "quality":
+        quality()
+    elif len(sys.argv) > 1 and sys.argv[1] == "large":
+        large()
+    else:
+        games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+        throughput(batch_games=games)
@@ -0,0 +1,110 @@
+import math
+import random
+
+import numpy as np
+
+from batch import Encoding
+from nim import Nim, NimAI
+
+
+class DenseNimAI(NimAI):
+    """
+    NimAI whose Q-values live in a dense NumPy array instead of a dict.
+
+    `self.q[state, action]` is the Q-value of an encoded state and
+    action (see `batch.Encoding`). Unavailable actions stay at 0.
+    """
+
+    def __init__(self, initial=[1, 3, 5, 7], alpha=0.5, epsilon=0.1,
+                 q=None):
+        """
+        Initialize AI for games starting from the piles `initial`,
+        with a Q-table of zeros unless an array `q` is given.
+        """
+        super().__init__(alpha, epsilon)
+        self.encoding = Encoding(initial)
+        shape = (self.encoding.num_states, self.encoding.num_actions)
+        if q is None:
+            q = np.zeros(shape)
+        elif q.shape != shape:
+            raise ValueError(f"Q-table of shape {q.shape} does not match "
+                             f"piles {self.encoding.initial}")
+        self.q = q
+
+    def get_q_value(self, state, action):
+        """
+        Return the Q-value for the state `state` and the action `action`.
+        """
+        return float(self.q[self.encoding.state(state),
+                            self.encoding.action(action)])
+
+    def update_q_value(self, state, action, old_q, reward, future_rewards):
+        """
+        Update the Q-value for the state `state` and the action `action`,
+        as in `NimAI.update_q_value`.
+        """
+        self.q[self.encoding.state(state), self.encoding.action(action)] = \
+            old_q + self.alpha * (reward + future_rewards - old_q)
+
+    def best_future_reward(self, state):
+        """
+        Return the highest Q-value available in `state`, or 0 if that
+        is negative or there are no available actions.
+        """
+        return max(float(self.q[self.encoding.state(state)].max()), 0)
+
+    def choose_action(self, state, epsilon=True):
+        """
+        Given a state `state`, return an action `(i, j)` to take,
+        as in `NimAI.choose_action`.
+        """
+        if epsilon:
+            return random.choice(sorted(Nim.available_actions(state)))
+        state = self.encoding.state(state)
+        values = np.where(self.encoding.valid[state], self.q[state], -math.inf)
+        return self.encoding.decode_action(int(values.argmax()))
+
+    def entries(self):
+        """
+        Yields `(state, action, q)` for every nonzero Q-value.
+        """
+        for state, action in zip(*np.nonzero(self.q)):
+            yield (tuple(self.encoding.decode_state(state)),
+                   self.encoding.decode_action(action),
+                   float(self.q[state, action]))
+
+    def best_future_rewards(self):
+        """
+        Returns `best_future_reward` of every encoded state as an array.
+        """
+        return np.maximum(self.q.max(axis=1), 0)
+
+    def best_actions(self):
+        """
+        Returns the encoded best available action of every encoded state
+        as an array, -1 for the empty board.
+        """
+        values = np.where(self.encoding.valid, self.q, -math.inf)
+        return np.where(self.encoding.num_valid > 0, values.argmax(axis=1), -1)
+
+    def nbytes(self):
+        """
+        Returns the number of bytes used by the Q-table.
+        """
+        return self.q.nbytes
+
+    def save(self, path):
+        """
+        Saves the Q-table to the `.npy` file `path`.
+        """
+        np.save(path, self.q)
+
+    @classmethod
+    def load(cls, path, initial=[1, 3, 5, 7], alpha=0.5, epsilon=0.1,
+             mode="r"):
+        """
+        Loads a Q-table saved with `save` for games starting from the
+        piles `initial`. The file is memory-mapped with `mode`, "r" for
+        playing or "r+" to keep training it in place.
+        """
+        return cls(initial, alpha, epsilon, np.load(path, mmap_mode=mode))
@@ -1,7 +1,14 @@
+import json
 import math
+import os
 import random
+import struct
 import time
 
+CHECKPOINT_FILE = os.path.join(os.path.dirname(__file__), "qtable.bin")
+CHECKPOINT_HEADER = b"NIMQ"
+CHECKPOINT_VERSION = 1
+
 
 class Nim():
 
@@ -86,6 +93,9 @@ class NimAI():
         self.alpha = alpha
         self.epsilon = epsilon
 
+        # Number of training games played so far
+        self.games = 0
+
     def update(self, old_state, action, new_state, reward):
         """
         Update Q-learning model, given an old state, an action taken
@@ -159,7 +169,7 @@ class NimAI():
         """
         actions = Nim.available_actions(state)
         if epsilon:
-            return random.sample(actions, 1)[0]
+            return random.choice(sorted(actions))
         
         reward = -math.inf 
         for action in actions:
@@ -168,18 +178,83 @@ class NimAI():
                 best_action = action
         return best_action
 
+    def entries(self):
+        """
+        Yields `(state, action, q)` for every Q-value in `self.q`.
+        """
+        for (state, action), q in self.q.items():
+            yield state, action, q
 
-def train(n):
+    def save_checkpoint(self, filename=CHECKPOINT_FILE, **metadata):
+        """
+        Saves the Q-table and training metadata to `filename`.
+
+        The file starts with CHECKPOINT_HEADER and CHECKPOINT_VERSION,
+        then the length of the JSON metadata and the metadata itself,
+        the number of piles and of entries, and finally one entry per
+        Q-value: the piles of the state and the action as 16-bit
+        integers, followed by the Q-value as a double.
+        """
+        entries = list(self.entries())
+        metadata = dict(metadata, alpha=self.alpha, epsilon=self.epsilon,
+                        games=self.games)
+        header = json.dumps(metadata).encode()
+        piles = len(entries[0][0]) if entries else 0
+        entry = struct.Struct(f"<{piles + 2}Hd")
+        with open(filename, "wb") as f:
+            f.write(CHECKPOINT_HEADER)
+            f.write(struct.pack("<HI", CHECKPOINT_VERSION, len(header)))
+            f.write(header)
+            f.write(struct.pack("<HI", piles, len(entries)))
+            for state, action, q in entries:
+                f.write(entry.pack(*state, *action, q))
+
+    @staticmethod
+    def load_checkpoint(filename=CHECKPOINT_FILE):
+        """
+        Loads an AI saved with `save_checkpoint`. The metadata is
+        available as the AI's `metadata` dictionary.
+        """
+        with open(filename, "rb") as f:
+            data = f.read()
+        if not data.startswith(CHECKPOINT_HEADER):
+            raise Exception("Invalid checkpoint")
+        offset = len(CHECKPOINT_HEADER)
+        version, length = struct.unpack_from("<HI", data, offset)
+        if version != CHECKPOINT_VERSION:
+            raise Exception(f"Unsupported checkpoint version {version}")
+        offset += 6
+        metadata = json.loads(data[offset:offset + length])
+        offset += length
+        piles, count = struct.unpack_from("<HI", data, offset)
+        offset += 6
+
+        ai = NimAI(metadata["alpha"], metadata["epsilon"])
+        ai.games = metadata["games"]
+        ai.metadata = metadata
+        entry = struct.Struct(f"<{piles + 2}Hd")
+        end = offset + count * entry.size
+        for values in entry.iter_unpack(data[offset:end]):
+            ai.q[(values[:piles], values[piles:piles + 2])] = values[-1]
+        return ai
+
+
+def train(n, verbose=True, player=None, initial=[1, 3, 5, 7]):
     """
-    Train an AI by playing `n` games against itself.
+    Train an AI by playing `n` games against itself, starting from
+    the piles `initial`.
+    If `verbose` is False, progress is not printed.
+    If `player` is given, that AI is trained instead of a new NimAI.
     """
 
-    player = NimAI()
+    if player is None:
+        player = NimAI()
 
     # Play n games
     for i in range(n):
-        print(f"Playing training game {i + 1}")
-        game = Nim()
+        if verbose:
+            print(f"Playing training game {i + 1}")
+        game = Nim(initial)
 
         # Keep track of last move made by either player
         last = {
@@ -222,7 +297,9 @@ def train(n):
                     0
                 )
 
-    print("Done training")
+    player.games += n
+    if verbose:
+        print("Done training")
 
     # Return the trained AI
     return player
@@ -0,0 +1,167 @@
+import itertools
+import math
+import random
+import time
+
+from functools import reduce
+from operator import xor
+
+import numpy as np
+
+from batch import Encoding
+from nim import Nim
+
+
+def nim_sum(piles):
+    """
+    Returns the bitwise XOR of all of the `piles`.
+    """
+    return reduce(xor, piles, 0)
+
+
+def winning(piles):
+    """
+    Returns True if the player to move in `piles` can force a win.
+
+    The player who removes the last object loses, so once every pile
+    has at most one object the player to move wins with an even number
+    of piles left, and otherwise with a nonzero nim-sum.
+    """
+    if all(pile <= 1 for pile in piles):
+        return nim_sum(piles) == 0
+    return nim_sum(piles) != 0
+
+
+def optimal_action(piles):
+    """
+    Returns an optimal action `(i, j)` in `piles`, or None if the game
+    is over. From a losing position, removes one object from the
+    largest pile.
+    """
+    if not any(piles):
+        return None
+    large = [i for i, pile in enumerate(piles) if pile > 1]
+
+    # With a single large pile, cut it to leave an odd number of 1s
+    if len(large) == 1:
+        i = large[0]
+        ones = sum(pile == 1 for pile in piles)
+        return (i, piles[i] - 1 + ones % 2)
+
+    # Otherwise play normal Nim, which never leaves a single large pile
+    total = nim_sum(piles)
+    if large and total:
+        for i, pile in enumerate(piles):
+            if pile ^ total < pile:
+                return (i, pile - (pile ^ total))
+    return (max(range(len(piles)), key=lambda i: piles[i]), 1)
+
+
+def win_rate(ai, initial=[1, 3, 5, 7]):
+    """
+    Plays the greedy `ai` against the oracle from every winning
+    position reachable from `initial`, with the AI to move, and
+    returns the fraction of those games the AI wins.
+    """
+    games = wins = 0
+    for piles in itertools.product(*(range(pile + 1) for pile in initial)):
+        if not any(piles) or not winning(piles):
+            continue
+        game = Nim(list(piles))
+        ai_player = game.player
+        while game.winner is None:
+            if game.player == ai_player:
+                game.move(ai.choose_action(game.piles, epsilon=False))
+            else:
+                game.move(optimal_action(game.piles))
+        games += 1
+        wins += game.winner == ai_player
+    return wins / games
+
+
+def winning_states(encoding):
+    """
+    Returns `winning` of every state of `encoding` as a boolean array.
+    """
+    total = np.bitwise_xor.reduce(encoding.piles, axis=1)
+    small = (encoding.piles <= 1).all(axis=1)
+    return np.where(small, total == 0, total != 0)
+
+
+def optimal_actions(encoding):
+    """
+    Returns a boolean array of the actions of every state of `encoding`
+    that leave the opponent in a losing position.
+    """
+    winning = winning_states(encoding)
+    return encoding.valid & ~winning[encoding.successor]
+
+
+def greedy_actions(ai, encoding):
+    """
+    Returns the encoded action the greedy `ai` takes in every state of
+    `encoding`, -1 for the empty board. Ties go to the first action,
+    except for AIs without a Q-table, which are asked for every state.
+    """
+    if getattr(ai, "encoding", None) is not None and \
+            ai.encoding.initial == encoding.initial:
+        return ai.best_actions()
+    q = np.zeros((encoding.num_states, encoding.num_actions))
+    try:
+        for state, action, value in ai.entries():
+            if encoding.contains(state):
+                q[encoding.state(state), encoding.action(action)] = value
+    except NotImplementedError:
+        actions = np.full(encoding.num_states, -1)
+        for state in range(1, encoding.num_states):
+            actions[state] = encoding.action(ai.choose_action(
+                encoding.decode_state(state), epsilon=False
+            ))
+        return actions
+    q = np.where(encoding.valid, q, -math.inf)
+    return np.where(encoding.num_valid > 0, q.argmax(axis=1), -1)
+
+
+def evaluate(ai, initial=[1, 3, 5, 7]):
+    """
+    Scores the greedy policy of `ai` against the oracle over every
+    state reachable from `initial`.
+
+    Returns a dictionary with the number of `states` and of `winning`
+    ones, the `agreement` of the AI with the oracle, the fraction of
+    winning states in which the AI takes a winning move, and the
+    evaluation time and throughput.
+    """
+    start = time.perf_counter()
+    encoding = Encoding(initial)
+    winning = winning_states(encoding)
+    winning[0] = False
+    actions = greedy_actions(ai, encoding)
+    states = np.flatnonzero(winning)
+    agreed = optimal_actions(encoding)[states, actions[states]]
+    seconds = time.perf_counter() - start
+    return {
+        "states": encoding.num_states - 1,
+        "winning": len(states),
+        "agreement": float(agreed.mean()) if len(states) else None,
+        "seconds": seconds,
+        "states_per_second": (encoding.num_states - 1) / seconds
+    }
+
+
+def sample_agreement(ai, initial, samples=1000, seed=0):
+    """
+    Estimates `evaluate`'s agreement from `samples` random winning
+    positions, for piles too large to enumerate every state.
+    """
+    rng = random.Random(seed)
+    agreed = total = 0
+    while total < samples:
+        piles = [rng.randint(0, pile) for pile in initial]
+        if not any(piles) or not winning(piles):
+            continue
+        i, j = ai.choose_action(piles, epsilon=False)
+        piles[i] -= j
+        agreed += not winning(piles)
+        total += 1
+    return agreed / total
@@ -0,0 +1,92 @@
+import os
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch import Encoding, play_batches, to_ai
+
+# Encoding of the game each worker process trains on
+worker_encoding = None
+
+
+def _init_worker(initial):
+    """
+    Builds the encoding once in each worker process.
+    """
+    global worker_encoding
+    worker_encoding = Encoding(initial)
+
+
+def _train_copy(q, games, batch, alpha, seed):
+    """
+    Trains a copy of the flat Q-table `q` for `games` games in a worker
+    process and returns (trained copy, visits per entry).
+    """
+    q = q.copy()
+    visits = np.zeros(len(q), dtype=np.int64)
+    play_batches(worker_encoding, q, visits, games, batch, alpha,
+                 np.random.default_rng(seed))
+    return q, visits
+
+
+def merge(q, copies, method="visits"):
+    """
+    Merges the trained `copies` of the Q-table `q`, a list of
+    (Q-table, visits) pairs, into `q` in place.
+
+    "average" replaces `q` by the mean of the copies. "visits" adds
+    every copy's change to `q` weighted by its share of the visits to
+    each entry, so copies that never updated an entry do not pull its
+    value back toward the old one.
+    """
+    if method == "average":
+        q[:] = np.mean([copy for copy, _ in copies], axis=0)
+    elif method == "visits":
+        total = sum(visits for _, visits in copies)
+        change = sum((copy - q) * visits for copy, visits in copies)
+        visited = total > 0
+        q[visited] += change[visited] / total[visited]
+    else:
+        raise ValueError(f"Unknown merge method {method!r}")
+
+
+def train_parallel(n, initial=[1, 3, 5, 7], processes=None, rounds=10,
+                   batch=1024, method="visits", alpha=0.5, epsilon=0.1,
+                   dense=False):
+    """
+    Train an AI by playing `n` games against itself across a pool of
+    worker processes. In each of `rounds` rounds every worker trains a
+    copy of the current Q-table with `train_batch`'s self-play, and the
+    copies are then merged with `method` (see `merge`).
+
+    Returns (trained NimAI, games per second).
+    """
+    start = time.perf_counter()
+    encoding = Encoding(initial)
+    size = encoding.num_states * encoding.num_actions
+    q = np.zeros(size)
+    visits = np.zeros(size, dtype=np.int64)
+
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(initial,)) as executor:
+        for r in range(rounds):
+
+            # Split this round's games evenly across the workers
+            games = n * (r + 1) // rounds - n * r // rounds
+            shares = [games * (w + 1) // workers - games * w // workers
+                      for w in range(workers)]
+            copies = list(executor.map(
+                _train_copy, [q] * workers, shares, [batch] * workers,
+                [alpha] * workers,
+                [random.getrandbits(64) for _ in range(workers)]
+            ))
+            merge(q, copies, method)
+            visits += sum(v for _, v in copies)
+
+    ai = to_ai(encoding, q, visits, alpha, epsilon, dense)
+    ai.games = n
+    return ai, n / (time.perf_counter() - start)
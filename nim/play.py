@@ -1,4 +1,11 @@
-from nim import train, play
+import os
 
-ai = train(10000)
+from nim import CHECKPOINT_FILE, NimAI, train, play
+
+# Start from the pretrained Q-table, training one if there is none
+if os.path.exists(CHECKPOINT_FILE):
+    ai = NimAI.load_checkpoint(CHECKPOINT_FILE)
+else:
+    ai = train(10000)
+    ai.save_checkpoint(trainer="train")
 play(ai)
@@ -0,0 +1,34 @@
+import argparse
+import os
+import time
+
+from batch import train_batch
+from nim import CHECKPOINT_FILE, NimAI
+from oracle import win_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pretrain the Nim AI")
+    parser.add_argument("games", type=int, nargs="?", default=1000000)
+    parser.add_argument("--output", default=CHECKPOINT_FILE,
+                        help="checkpoint to write")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue training the existing checkpoint")
+    args = parser.parse_args()
+
+    player = None
+    if args.resume and os.path.exists(args.output):
+        player = NimAI.load_checkpoint(args.output)
+        print(f"Resuming after {player.games} games")
+
+    ai, rate = train_batch(args.games, player=player)
+    print(f"Trained {args.games} games at {rate:.0f} games/sec, "
+          f"{ai.games} in total")
+    ai.save_checkpoint(args.output, trainer="train_batch",
+                       created=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       win_rate=win_rate(ai))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
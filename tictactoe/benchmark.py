@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import timeit
+
+import bitboard
+import tictactoe as ttt
+
+# A mid-game position with X to move
+BOARD = [[ttt.X, ttt.O, ttt.EMPTY],
+         [ttt.EMPTY, ttt.X, ttt.EMPTY],
+         [ttt.O, ttt.EMPTY, ttt.EMPTY]]
+
+
+def microbenchmark(number=100000):
+    """
+    Times `result`, `winner` and `actions` for the list and bitboard
+    representations, printing microseconds per call.
+    """
+    bits = bitboard.from_lists(BOARD)
+    cases = [
+        ("result", lambda: ttt.result(BOARD, (1, 2)),
+         lambda: bitboard.result(bits, 5)),
+        ("winner", lambda: ttt.winner(BOARD),
+         lambda: bitboard.winner(bits)),
+        ("actions", lambda: ttt.actions(BOARD),
+         lambda: bitboard.actions(bits))
+    ]
+    print(f"{'function':>8} {'lists':>10} {'bitboard':>10} {'speedup':>8}")
+    for name, lists, bitboards in cases:
+        lists = timeit.timeit(lists, number=number) / number * 1e6
+        bitboards = timeit.timeit(bitboards, number=number) / number * 1e6
+        print(f"{name:>8} {lists:>8.3f}us {bitboards:>8.3f}us "
+              f"{lists / bitboards:>7.1f}x")
+
+
+def parallel_speedup():
+    """
+    Prints the speedup of parallel_search over search across process
+    counts, on larger boards with an empty transposition table.
+    """
+    variants = [
+        ("3x4 k=3", ttt.initial_state(3, 4), 3),
+        ("4x4 k=4", ttt.result(ttt.result(ttt.initial_state(4, 4), (0, 0)),
+                               (1, 1)), 4)
+    ]
+    for name, board, k in variants:
+        ttt.clear_transpositions()
+        serial = ttt.search(board, k)["time"]
+        print(f"{name}: serial {serial:.4f}s")
+        print(f"{'processes':>9} {'time':>10} {'speedup':>8}")
+        for processes in range(1, (os.cpu_count() or 1) + 1):
+            ttt.clear_transpositions()
+            start = time.perf_counter()
+            ttt.parallel_search(board, k, processes)
+            seconds = time.perf_counter() - start
+            print(f"{processes:>9} {seconds:>9.4f}s {serial / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "parallel":
+        parallel_speedup()
+    else:
+        microbenchmark()
@@ -0,0 +1,124 @@
+"""
+Tic Tac Toe bitboards
+
+A board is a pair of 9-bit masks `(x, o)`, one per player, where bit
+3 * i + j is set if the player has marked cell (i, j). Actions are
+cell indices 0-8.
+"""
+
+from tictactoe import X, O, EMPTY
+
+FULL = 0b111111111
+
+# Rows, columns and diagonals
+WIN_MASKS = (
+    [0b111 << (3 * i) for i in range(3)] +
+    [0b001001001 << j for j in range(3)] +
+    [0b100010001, 0b001010100]
+)
+
+# Lookup tables indexed by a 9-bit mask
+WINNING = [any(mask & win == win for win in WIN_MASKS) for mask in range(512)]
+CELLS = [tuple(i for i in range(9) if mask >> i & 1) for mask in range(512)]
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return (0, 0)
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    x, o = board
+    return O if x.bit_count() > o.bit_count() else X
+
+
+def actions(board):
+    """
+    Returns a tuple of all free cell indices on the board.
+    """
+    return CELLS[FULL & ~(board[0] | board[1])]
+
+
+def result(board, action):
+    """
+    Returns the board that results from marking cell `action`.
+    """
+    x, o = board
+    if not 0 <= action < 9 or (x | o) >> action & 1:
+        raise Exception("Invalid Play")
+    bit = 1 << action
+    if x.bit_count() > o.bit_count():
+        return (x, o | bit)
+    return (x | bit, o)
+
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = board
+    if WINNING[x]:
+        return X
+    if WINNING[o]:
+        return O
+    return None
+
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return (board[0] | board[1]) == FULL or winner(board) is not None
+
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    w = winner(board)
+    return 1 if w == X else -1 if w == O else 0
+
+
+def from_lists(board):
+    """
+    Converts a nested-list board into a bitboard.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return (x, o)
+
+
+def to_lists(board):
+    """
+    Converts a bitboard into a nested-list board.
+    """
+    x, o = board
+    return [
+        [X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+         for j in range(3)]
+        for i in range(3)
+    ]
+
+
+def to_action(cell):
+    """
+    Converts an `(i, j)` action into a cell index.
+    """
+    return 3 * cell[0] + cell[1]
+
+
+def to_cell(action):
+    """
+    Converts a cell index into an `(i, j)` action.
+    """
+    return divmod(action, 3)
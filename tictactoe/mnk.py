@@ -0,0 +1,295 @@
+"""
+Iterative-deepening alpha-beta search for m,n,k games
+"""
+
+import math
+import random
+import time
+
+from tictactoe import X, EMPTY
+
+# Value of a win, larger than any heuristic evaluation
+WIN = 10 ** 9
+
+# Bounds on the value stored in the transposition table
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Boards with at most this many cells consider every empty cell as a move;
+# larger boards only consider cells next to existing marks
+SMALL_BOARD = 16
+
+
+class Timeout(Exception):
+    pass
+
+
+class Engine():
+    """
+    Search engine for boards of a fixed height, width and k, with a
+    transposition table that is kept between moves.
+    """
+
+    def __init__(self, height, width, k):
+        self.height = height
+        self.width = width
+        self.k = k
+        size = height * width
+
+        # Every line of k cells, and the lines through each cell
+        self.windows = []
+        for i in range(height):
+            for j in range(width):
+                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    end_i, end_j = i + (k - 1) * di, j + (k - 1) * dj
+                    if 0 <= end_i < height and 0 <= end_j < width:
+                        self.windows.append([
+                            (i + s * di) * width + (j + s * dj)
+                            for s in range(k)
+                        ])
+        self.windows_of = [[] for _ in range(size)]
+        for w, cells in enumerate(self.windows):
+            for cell in cells:
+                self.windows_of[cell].append(w)
+
+        # Cells within one step of each cell
+        self.neighbors = [
+            [ni * width + nj
+             for ni in range(i - 1, i + 2) for nj in range(j - 1, j + 2)
+             if (ni, nj) != (i, j) and 0 <= ni < height and 0 <= nj < width]
+            for i in range(height) for j in range(width)
+        ]
+
+        # A window holding only one player's marks is worth 4 ** marks
+        self.weights = [0] + [4 ** n for n in range(1, k + 1)]
+
+        rng = random.Random(0)
+        self.zobrist = [[rng.getrandbits(64), rng.getrandbits(64)]
+                        for _ in range(size)]
+        self.table = dict()
+
+    def load(self, board):
+        """
+        Sets up the search state from a nested-list board.
+        Returns the player to move, 0 for X or 1 for O.
+        """
+        self.cells = [EMPTY] * (self.height * self.width)
+        self.counts = [[0] * len(self.windows), [0] * len(self.windows)]
+        self.score = 0
+        self.hash = 0
+        self.moves = []
+        for i in range(self.height):
+            for j in range(self.width):
+                if board[i][j] != EMPTY:
+                    self.play(i * self.width + j, 0 if board[i][j] == X else 1)
+        counts = [self.cells.count(0), self.cells.count(1)]
+        return 1 if counts[0] > counts[1] else 0
+
+    def window_value(self, w):
+        """Returns the heuristic value of window `w` from X's perspective."""
+        xs, os = self.counts[0][w], self.counts[1][w]
+        if os == 0:
+            return self.weights[xs]
+        if xs == 0:
+            return -self.weights[os]
+        return 0
+
+    def play(self, cell, p):
+        """
+        Marks `cell` for player `p`, updating the evaluation incrementally.
+        Returns True if the move completes a line of k.
+        """
+        won = False
+        counts = self.counts[p]
+        for w in self.windows_of[cell]:
+            old = self.window_value(w)
+            counts[w] += 1
+            self.score += self.window_value(w) - old
+            if counts[w] == self.k:
+                won = True
+        self.cells[cell] = p
+        self.hash ^= self.zobrist[cell][p]
+        self.moves.append(cell)
+        return won
+
+    def undo(self, cell, p):
+        """Removes player `p`'s mark from `cell`."""
+        counts = self.counts[p]
+        for w in self.windows_of[cell]:
+            old = self.window_value(w)
+            counts[w] -= 1
+            self.score += self.window_value(w) - old
+        self.cells[cell] = EMPTY
+        self.hash ^= self.zobrist[cell][p]
+        self.moves.pop()
+
+    def candidates(self):
+        """Returns the cells worth considering as moves."""
+        if len(self.cells) <= SMALL_BOARD:
+            return [c for c, mark in enumerate(self.cells) if mark == EMPTY]
+        if not self.moves:
+            return [(self.height // 2) * self.width + self.width // 2]
+        return list({n for c in self.moves for n in self.neighbors[c]
+                     if self.cells[n] == EMPTY})
+
+    def urgency(self, cell):
+        """
+        Returns how much playing `cell` would extend either player's
+        open lines, used to order moves.
+        """
+        total = 0
+        for w in self.windows_of[cell]:
+            xs, os = self.counts[0][w], self.counts[1][w]
+            if os == 0:
+                total += self.weights[xs + 1]
+            if xs == 0:
+                total += self.weights[os + 1]
+        return total
+
+    def negamax(self, depth, alpha, beta, p, ply):
+        """
+        Returns the value of the position for player `p` to move,
+        searching `depth` plies with alpha-beta pruning.
+        """
+        self.nodes += 1
+        if self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+            raise Timeout
+        if len(self.moves) == len(self.cells):
+            return 0
+        if depth == 0:
+            return self.score if p == 0 else -self.score
+
+        best_move = None
+        entry = self.table.get(self.hash)
+        if entry is not None:
+            entry_depth, value, bound, best_move = entry
+            value = self.from_table(value, ply)
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return value
+                elif bound == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        # Try the best move from earlier searches first, then urgent moves
+        moves = sorted(self.candidates(), key=self.urgency, reverse=True)
+        if best_move in moves:
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+        alpha_ = alpha
+        best = -math.inf
+        for cell in moves:
+
+            # Undo the move even if the search times out below it
+            won = self.play(cell, p)
+            try:
+                if won:
+                    value = WIN - ply
+                else:
+                    value = -self.negamax(depth - 1, -beta, -alpha,
+                                          1 - p, ply + 1)
+            finally:
+                self.undo(cell, p)
+            if value > best:
+                best, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best <= alpha_:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table[self.hash] = (depth, self.to_table(best, ply), bound,
+                                 best_move)
+        return best
+
+    def to_table(self, value, ply):
+        """
+        Converts a win or loss `ply` plies below the root into one
+        counted from the current node, so that the stored value is
+        valid wherever the position is reached.
+        """
+        if value >= WIN - len(self.cells):
+            return value + ply
+        if value <= -(WIN - len(self.cells)):
+            return value - ply
+        return value
+
+    def from_table(self, value, ply):
+        """
+        Converts a stored win or loss counted from its node back into
+        one counted from the root, `ply` plies above.
+        """
+        if value >= WIN - len(self.cells):
+            return value - ply
+        if value <= -(WIN - len(self.cells)):
+            return value + ply
+        return value
+
+    def search(self, board, budget):
+        """
+        Searches the board with iterative deepening until the search is
+        solved or `budget` seconds have passed.
+        Returns a dictionary with the chosen `action`, its `value` for the
+        player to move, the `depth` completed, and the number of `nodes`
+        searched and `time` taken.
+        """
+        start = time.perf_counter()
+        self.deadline = start + budget
+        self.nodes = 0
+        p = self.load(board)
+        stats = {"action": None, "value": None, "depth": 0}
+
+        remaining = len(self.cells) - len(self.moves)
+        if remaining and self.finished() is None:
+            for depth in range(1, remaining + 1):
+                try:
+                    value = self.negamax(depth, -math.inf, math.inf, p, 0)
+                except Timeout:
+                    break
+                move = self.table[self.hash][3]
+                stats["action"] = divmod(move, self.width)
+                stats["value"] = value
+                stats["depth"] = depth
+
+                # Stop once the result is forced
+                if abs(value) >= WIN - len(self.cells):
+                    break
+
+            # Fall back to the most urgent move if no depth completed
+            if stats["action"] is None:
+                move = max(self.candidates(), key=self.urgency)
+                stats["action"] = divmod(move, self.width)
+
+        stats["nodes"] = self.nodes
+        stats["time"] = time.perf_counter() - start
+        return stats
+
+    def finished(self):
+        """Returns the winner's index if a line is complete, else None."""
+        for p in (0, 1):
+            if self.k in self.counts[p]:
+                return p
+        return None
+
+
+engines = dict()
+
+
+def deepening_search(board, k=3, budget=1.0):
+    """
+    Searches for the best action on a board of any size with k in a row
+    to win, using at most about `budget` seconds.
+    """
+    shape = (len(board), len(board[0]), k)
+    if shape not in engines:
+        engines[shape] = Engine(*shape)
+    return engines[shape].search(board, budget)
@@ -112,7 +112,12 @@ while True:
         if user != player and not game_over:
             if ai_turn:
                 time.sleep(0.5)
-                move = ttt.minimax(board)
+                if ttt.lookup(board) is not None:
+                    move = ttt.minimax(board)
+                else:
+                    stats = ttt.search(board)
+                    print(f"AI searched {stats['nodes']} nodes in {stats['time']:.4f}s")
+                    move = stats["action"]
                 board = ttt.result(board, move)
                 ai_turn = False
             else:
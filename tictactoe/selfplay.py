@@ -0,0 +1,140 @@
+import argparse
+import json
+import math
+import random
+import time
+
+import mnk
+import tictactoe as ttt
+
+
+def table_search(board, k=3):
+    """
+    Looks up the move in the precomputed solution table.
+    """
+    start = time.perf_counter()
+    action = ttt.minimax(board, k)
+    return {"action": action, "nodes": 0, "time": time.perf_counter() - start}
+
+
+BACKENDS = {
+    "search": ttt.search,
+    "parallel": ttt.parallel_search,
+    "table": table_search,
+    "deepening": mnk.deepening_search
+}
+
+
+def percentile(values, p):
+    """
+    Returns the `p`th percentile of `values` by the nearest-rank method.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def play_game(search, opponent, ai_player, height, width, k, rng):
+    """
+    Plays one game and returns (winner, list of AI move stats).
+    `opponent` is "ai" for self-play or "random" for random moves
+    by the player other than `ai_player`.
+    """
+    board = ttt.initial_state(height, width)
+    moves = []
+    while not ttt.terminal(board, k):
+        if opponent == "random" and ttt.player(board) != ai_player:
+            action = rng.choice(sorted(ttt.actions(board)))
+        else:
+            stats = search(board, k)
+            moves.append(stats)
+            action = stats["action"]
+        board = ttt.result(board, action)
+    return ttt.winner(board, k), moves
+
+
+def reset_caches():
+    """
+    Empties the transposition tables the backends keep between searches.
+    """
+    ttt.clear_transpositions()
+    mnk.engines.clear()
+
+
+def run(backend, games, opponent="ai", height=3, width=3, k=3, seed=0,
+        reset="run"):
+    """
+    Plays `games` games with the AI `backend` and returns a report of
+    outcomes, nodes per second and per-move latency percentiles.
+    Transposition tables start empty, and are emptied again before
+    every game if `reset` is "game" rather than "run".
+    """
+    if reset not in ("run", "game"):
+        raise Exception(f"Unknown reset {reset!r}")
+    search = BACKENDS[backend]
+    rng = random.Random(seed)
+    outcomes = {ttt.X: 0, ttt.O: 0, "tie": 0}
+    losses = 0
+    latencies = []
+    nodes = 0
+
+    reset_caches()
+    for i in range(games):
+        if reset == "game" and i > 0:
+            reset_caches()
+        ai_player = ttt.X if i % 2 == 0 else ttt.O
+        winner, moves = play_game(search, opponent, ai_player,
+                                  height, width, k, rng)
+        outcomes[winner or "tie"] += 1
+        if opponent == "random" and winner not in (None, ai_player):
+            losses += 1
+        for stats in moves:
+            latencies.append(stats["time"])
+            nodes += stats["nodes"]
+
+    seconds = sum(latencies)
+    return {
+        "backend": backend,
+        "opponent": opponent,
+        "board": {"height": height, "width": width, "k": k},
+        "games": games,
+        "reset": reset,
+        "outcomes": outcomes,
+        "ai_losses": losses,
+        "moves": len(latencies),
+        "nodes": nodes,
+        "seconds": seconds,
+        "nodes_per_second": nodes / seconds if seconds else None,
+        "latency_ms": {
+            f"p{p}": percentile(latencies, p) * 1000 if latencies else None
+            for p in (50, 90, 99, 100)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless tictactoe AI self-play")
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("-b", "--backend", choices=sorted(BACKENDS), default="search")
+    parser.add_argument("-o", "--opponent", choices=["ai", "random"], default="ai")
+    parser.add_argument("--height", type=int, default=3)
+    parser.add_argument("--width", type=int, default=3)
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", choices=["run", "game"], default="run",
+                        help="empty transposition tables once per run or before every game")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.backend, args.games, args.opponent,
+                 args.height, args.width, args.k, args.seed, args.reset)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import sys
+
+import tictactoe as ttt
+
+
+def reachable(board, boards):
+    """
+    Adds every board reachable from `board` to `boards`,
+    keyed by its index in the solution table.
+    """
+    index = ttt.encode(board)
+    if index in boards:
+        return
+    boards[index] = board
+    if not ttt.terminal(board):
+        for action in ttt.actions(board):
+            reachable(ttt.result(board, action), boards)
+
+
+def build():
+    """
+    Solves every reachable board with the search engine.
+    Returns the solution table as bytes.
+    """
+    boards = dict()
+    reachable(ttt.initial_state(), boards)
+    table = bytearray([ttt.UNSOLVED]) * 3 ** 9
+    for index, board in boards.items():
+        if ttt.terminal(board):
+            value, move = ttt.utility(board), ttt.NO_MOVE
+        else:
+            stats = ttt.search(board)
+            value = stats["value"]
+            move = 3 * stats["action"][0] + stats["action"][1]
+        table[index] = (value + 1) << 4 | move
+    return bytes(table), boards
+
+
+def validate(table, boards):
+    """
+    Checks that the table agrees with the search engine on every board.
+    """
+    ttt.solutions = table
+    for board in boards.values():
+        if ttt.minimax(board) != ttt.search(board)["action"]:
+            sys.exit(f"Table disagrees with search on {board}")
+
+
+def main():
+    table, boards = build()
+    validate(table, boards)
+    with open(ttt.SOLUTIONS_FILE, "wb") as f:
+        f.write(ttt.SOLUTIONS_HEADER + table)
+    print(f"Solved {len(boards)} positions")
+
+
+if __name__ == "__main__":
+    main()
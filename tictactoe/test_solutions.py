@@ -0,0 +1,48 @@
+from functools import lru_cache
+
+import tictactoe as ttt
+
+
+@lru_cache(maxsize=None)
+def value(board):
+    """
+    Returns the minimax value of `board`, a tuple of rows, by full
+    search without pruning or transpositions.
+    """
+    board = [list(row) for row in board]
+    if ttt.terminal(board):
+        return ttt.utility(board)
+    values = [value(freeze(ttt.result(board, action)))
+              for action in ttt.actions(board)]
+    return max(values) if ttt.player(board) == ttt.X else min(values)
+
+
+def freeze(board):
+    return tuple(tuple(row) for row in board)
+
+
+def reachable(board, boards):
+    """
+    Adds every board reachable from `board` to `boards`.
+    """
+    if freeze(board) in boards:
+        return
+    boards.add(freeze(board))
+    if not ttt.terminal(board):
+        for action in ttt.actions(board):
+            reachable(ttt.result(board, action), boards)
+
+
+def test_table_matches_full_minimax():
+    assert ttt.solutions is not None
+    boards = set()
+    reachable(ttt.initial_state(), boards)
+    assert len(boards) == 5478
+    for frozen in boards:
+        board = [list(row) for row in frozen]
+        table_value, action = ttt.lookup(board)
+        assert table_value == value(frozen)
+        if ttt.terminal(board):
+            assert action is None
+        else:
+            assert value(freeze(ttt.result(board, action))) == table_value
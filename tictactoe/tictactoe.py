@@ -2,30 +2,42 @@
 Tic Tac Toe Player
 """
 
+import atexit
 import math
-import copy 
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Precomputed solutions for every reachable board, built by solve.py
+SOLUTIONS_FILE = os.path.join(os.path.dirname(__file__), "solutions.bin")
+SOLUTIONS_HEADER = b"TTT1"
+
+# Table entries are (value + 1) << 4 | move, with move 9 for no move
+NO_MOVE = 9
+UNSOLVED = 0xFF
+
+
+# Directions in which a line of k marks can run
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
 
-def initial_state():
+
+def initial_state(height=3, width=3):
     """
     Returns starting state of the board.
     """
-    return [[EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY]]
+    return [[EMPTY] * width for _ in range(height)]
 
 
 def player(board):
     """
     Returns player who has the next turn on a board.
     """
-    if board == [[EMPTY, EMPTY, EMPTY],[EMPTY, EMPTY, EMPTY],[EMPTY, EMPTY, EMPTY]]:
-        return X
-        
     count_x = 0
     count_o = 0
 
@@ -61,54 +73,66 @@ def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
-    
-    if not any(action==i for i in actions(board)):
+    i, j = action
+    if not (0 <= i < len(board) and 0 <= j < len(board[i])) or board[i][j] != EMPTY:
         raise Exception("Invalid Play")
-    
-    board_ = copy.deepcopy(board)
+
+    board_ = [row.copy() for row in board]
     whois = player(board)
     board_[action[0]][action[1]] = whois
     return board_
 
 
-def winner(board):
+def lines(height, width, k):
     """
-    Returns the winner of the game, if there is one.
+    Returns (getters, X line, O line) for a height x width board: one
+    getter per line of `k` cells, returning the marks on that line
+    from the board's cells in row-major order, and the marks of a line
+    won by X or O.
     """
-    b = list(map(lambda *x: list(x), *board))
-    d1 = [board[0][0], board[1][1], board[2][2]]
-    d2 = [board[0][2], board[1][1], board[2][0]]
+    if (height, width, k) not in _lines:
+        getters = []
+        for i in range(height):
+            for j in range(width):
+                for di, dj in DIRECTIONS:
+                    end_i, end_j = i + (k - 1) * di, j + (k - 1) * dj
+                    if 0 <= end_i < height and 0 <= end_j < width:
+                        getters.append(itemgetter(*[
+                            (i + s * di) * width + j + s * dj
+                            for s in range(k)
+                        ]))
+
+        # A getter of a single cell returns the mark, not a tuple
+        won = ((X,) * k, (O,) * k) if k > 1 else (X, O)
+        _lines[(height, width, k)] = (getters,) + won
+    return _lines[(height, width, k)]
 
-    for i in board:
-        if i == [X,X,X]:
-            return X 
-        if i == [O,O,O]:
-            return O
-    for i in b:
-        if i == [X,X,X]:
-            return X 
-        if i == [O,O,O]:
-            return O
-        
-    if d1 == [X,X,X]:
-        return X
-    if d2 == [X,X,X]:
-        return X
-    
-    if d1 == [O,O,O]:
-        return O
-    if d2 == [O,O,O]:
-        return O
 
+_lines = dict()
+
+
+def winner(board, k=3):
+    """
+    Returns the winner of the game, if there is one.
+    A player wins with `k` marks in a row, column or diagonal.
+    """
+    getters, x_line, o_line = lines(len(board), len(board[0]), k)
+    cells = [cell for row in board for cell in row]
+    for getter in getters:
+        line = getter(cells)
+        if line == x_line:
+            return X
+        if line == o_line:
+            return O
     return None
 
 
-def terminal(board):
+def terminal(board, k=3):
     """
     Returns True if game is over, False otherwise.
     """
-    if winner(board) == X or winner(board) == O:
-        return True     
+    if winner(board, k) is not None:
+        return True
     for i in board: 
         for j in i: 
             if j == EMPTY:
@@ -116,49 +140,278 @@ def terminal(board):
     return True
 
 
-def utility(board):
+def utility(board, k=3):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    w = winner(board)
+    w = winner(board, k)
     if w == X:
         return 1
     if w == O:
         return -1
     return 0
 
-def _max(board):
-    v = -math.inf
-    if terminal(board):
-        return utility(board)
-    for action in actions(board):
-        v = max(v, _min(result(board, action)))
-    return v
+def symmetries(height, width):
+    """
+    Returns the symmetries of a height x width board, as permutations of
+    the cells in row-major order: 8 for a square board, 4 otherwise.
+    """
+    if (height, width) not in _symmetries:
+        h, w = height - 1, width - 1
+        transforms = [
+            lambda i, j: (i, j),
+            lambda i, j: (h - i, w - j),
+            lambda i, j: (i, w - j),
+            lambda i, j: (h - i, j)
+        ]
+        if height == width:
+            transforms += [
+                lambda i, j: (j, w - i),
+                lambda i, j: (w - j, i),
+                lambda i, j: (j, i),
+                lambda i, j: (w - j, h - i)
+            ]
+        _symmetries[(height, width)] = [
+            [transform(i, j) for i in range(height) for j in range(width)]
+            for transform in transforms
+        ]
+    return _symmetries[(height, width)]
+
+
+_symmetries = dict()
+
+# Bounds on the value stored in the transposition table
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Maps (k, canonical board) to (value, bound), shared across searches
+transpositions = dict()
 
-def _min(board):
-    v = math.inf
-    if terminal(board):
-        return utility(board)
-    for action in actions(board):
-        v = min(v, _max(result(board, action)))
-    return v
+# Entries added by the current task of a worker process, or None
+journal = None
 
-def minimax(board):
+# Worker pool reused by parallel_search across moves, and its size
+pool = None
+pool_processes = None
+
+
+def canonical(board):
     """
-    Returns the optimal action for the current player on the board.
+    Returns a key for the board that is identical for all boards
+    equivalent under rotation and reflection.
     """
-    if terminal(board) == True:
-        return None
-    
-    elif player(board) == X:
-        plays = []
+    height, width = len(board), len(board[0])
+    return (height, width, min(
+        "".join(board[i][j] or "-" for (i, j) in cells)
+        for cells in symmetries(height, width)
+    ))
+
+
+def alphabeta(board, alpha, beta, stats, k=3):
+    """
+    Returns the minimax value of the board, searching with alpha-beta
+    pruning and memoizing results in the transposition table.
+    """
+    stats["nodes"] += 1
+    if terminal(board, k):
+        return utility(board, k)
+
+    key = (k, canonical(board))
+    if key in transpositions:
+        value, bound = transpositions[key]
+        if bound == EXACT:
+            return value
+        elif bound == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    alpha_, beta_ = alpha, beta
+    if player(board) == X:
+        value = -math.inf
         for action in actions(board):
-            plays.append([_min(result(board, action)), action])
-        return sorted(plays, key=lambda x: x[0], reverse=True)[0][1]
-    
-    elif player(board) == O:
-        plays = []
+            value = max(value, alphabeta(result(board, action), alpha, beta, stats, k))
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+    else:
+        value = math.inf
         for action in actions(board):
-            plays.append([_max(result(board, action)), action])
-        return sorted(plays, key=lambda x: x[0], reverse=False)[0][1]
-    
+            value = min(value, alphabeta(result(board, action), alpha, beta, stats, k))
+            beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+    if value <= alpha_:
+        entry = (value, UPPER)
+    elif value >= beta_:
+        entry = (value, LOWER)
+    else:
+        entry = (value, EXACT)
+    transpositions[key] = entry
+    if journal is not None:
+        journal[key] = entry
+    return value
+
+
+def search(board, k=3):
+    """
+    Searches for the optimal action for the current player on the board.
+    Returns a dictionary with the chosen `action`, its `value`, and the
+    number of `nodes` searched and `time` taken.
+    """
+    start = time.perf_counter()
+    stats = {"action": None, "value": None, "nodes": 0}
+    if not terminal(board, k):
+        maximizing = player(board) == X
+        alpha, beta = -math.inf, math.inf
+        for action in actions(board):
+            value = alphabeta(result(board, action), alpha, beta, stats, k)
+
+            # Keep the first of equally good actions
+            if maximizing and value > alpha:
+                alpha = value
+                stats["action"], stats["value"] = action, value
+            elif not maximizing and value < beta:
+                beta = value
+                stats["action"], stats["value"] = action, value
+    stats["time"] = time.perf_counter() - start
+    return stats
+
+
+def _init_worker(table):
+    transpositions.update(table)
+
+
+def _score_action(board, action, k):
+    """
+    Scores one root action in a worker process.
+    Returns (value, nodes, transposition entries written by the search).
+    """
+    global journal
+    journal = dict()
+    try:
+        stats = {"nodes": 0}
+        value = alphabeta(result(board, action), -math.inf, math.inf, stats, k)
+        return value, stats["nodes"], journal
+    finally:
+        journal = None
+
+
+def close_pool():
+    """
+    Shuts down the worker pool of parallel_search, if there is one.
+    """
+    global pool, pool_processes
+    if pool is not None:
+        pool.shutdown()
+        pool = pool_processes = None
+
+
+def clear_transpositions():
+    """
+    Empties the transposition table, along with the tables kept by the
+    workers of parallel_search.
+    """
+    transpositions.clear()
+    close_pool()
+
+
+atexit.register(close_pool)
+
+
+def parallel_search(board, k=3, processes=None):
+    """
+    Searches for the optimal action by scoring every root action in a
+    pool of `processes` worker processes.
+    The pool is kept for later searches. Workers start from the shared
+    transposition table when the pool is created and keep their own
+    tables from then on; the entries each task writes are merged back
+    into the shared table.
+    Returns a dictionary like `search`.
+    """
+    global pool, pool_processes
+    start = time.perf_counter()
+    stats = {"action": None, "value": None, "nodes": 0}
+    if not terminal(board, k):
+        candidates = list(actions(board))
+        if pool is None or pool_processes != processes:
+            close_pool()
+            pool = ProcessPoolExecutor(processes, initializer=_init_worker,
+                                       initargs=(transpositions,))
+            pool_processes = processes
+        scores = list(pool.map(_score_action, [board] * len(candidates),
+                               candidates, [k] * len(candidates)))
+
+        # Argmax for X, argmin for O, keeping the first of equal actions
+        sign = 1 if player(board) == X else -1
+        best = -math.inf
+        for action, (value, nodes, added) in zip(candidates, scores):
+            stats["nodes"] += nodes
+            transpositions.update(added)
+            if sign * value > best:
+                best = sign * value
+                stats["action"], stats["value"] = action, value
+    stats["time"] = time.perf_counter() - start
+    return stats
+
+
+def encode(board):
+    """
+    Returns the base-3 index of the board in the solution table.
+    """
+    index = 0
+    for row in reversed(board):
+        for cell in reversed(row):
+            index = 3 * index + (1 if cell == X else 2 if cell == O else 0)
+    return index
+
+
+def load_solutions(filename=SOLUTIONS_FILE):
+    """
+    Loads the precomputed solution table, or returns None if it has
+    not been built.
+    """
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if not data.startswith(SOLUTIONS_HEADER):
+        raise Exception("Invalid solution table")
+    return data[len(SOLUTIONS_HEADER):]
+
+
+solutions = load_solutions()
+
+
+def lookup(board, k=3):
+    """
+    Returns (value, optimal action) of the board from the solution
+    table, or None if the board is not in the table.
+    """
+    if solutions is None or k != 3 or len(board) != 3 or len(board[0]) != 3:
+        return None
+    entry = solutions[encode(board)]
+    if entry == UNSOLVED:
+        return None
+    move = entry & 0xF
+    return (entry >> 4) - 1, None if move == NO_MOVE else divmod(move, 3)
+
+
+def minimax(board, k=3, budget=1.0):
+    """
+    Returns the optimal action for the current player on the board.
+    Boards that are not in the solution table, such as larger boards,
+    are searched with iterative deepening for about `budget` seconds.
+    """
+    solved = lookup(board, k)
+    if solved is not None:
+        return solved[1]
+
+    # Imported here because mnk imports this module
+    from mnk import deepening_search
+    return deepening_search(board, k, budget)["action"]